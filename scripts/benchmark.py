@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the template validator and the deck image pipeline.
+
+Generates synthetic templates shaped like templates/cdx/*.json at several
+scales, times both scripts against them and writes the numbers to a JSON
+file that can be compared between commits.
+
+Usage:
+    python3 scripts/benchmark.py
+    python3 scripts/benchmark.py --scales small,large --output before.json
+    python3 scripts/benchmark.py --compare before.json
+
+The image benchmark needs Pillow; it is skipped if Pillow is missing.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Named scales: spaces, decks per space, cards per deck, journey steps per
+# hero deck and characters of content per card
+SCALES = {
+    'small': {'spaces': 2, 'decks': 5, 'cards': 4, 'steps': 3, 'content_length': 300},
+    'medium': {'spaces': 2, 'decks': 8, 'cards': 50, 'steps': 5, 'content_length': 600},
+    'large': {'spaces': 4, 'decks': 12, 'cards': 500, 'steps': 8, 'content_length': 1000},
+    'huge': {'spaces': 4, 'decks': 20, 'cards': 2500, 'steps': 10, 'content_length': 1500},
+}
+
+WORDS = (
+    "player enemy level design loop reward combat craft explore unlock upgrade balance "
+    "feedback tutorial boss quest item resource progression camera input audio ui "
+    "hp damage speed rate seconds"
+).split()
+
+def load_script(name: str, filename: str):
+    """Import a script from this directory as a module (handles dashes in names)."""
+    # The scripts import their helper modules (e.g. profiling) from this directory
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def make_content(rng: random.Random, length: int) -> str:
+    """Generate card content of roughly `length` characters."""
+    lines = [' '.join(rng.choice(WORDS) for _ in range(4)).title()]
+    size = len(lines[0])
+    while size < length:
+        line = '- ' + ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 14)))
+        # Sprinkle in some metrics so the content rules have matches to report
+        if rng.random() < 0.05:
+            line += f' {rng.randint(1, 99)}%x'
+        lines.append(line)
+        size += len(line) + 1
+    return '\n'.join(lines)
+
+def generate_template(spaces: int, decks: int, cards: int, steps: int, content_length: int,
+                      seed: int = 0) -> Dict:
+    """Generate a synthetic template shaped like templates/cdx/*.json."""
+    rng = random.Random(seed)
+    template = {
+        'meta': {
+            'id': 'bench/synthetic',
+            'title': 'Synthetic Benchmark Template',
+            'description': 'Generated by scripts/benchmark.py',
+            'tags': ['gamedev'],
+            'imageUrl': None,
+        },
+        'tags': [
+            {'tag': 'bug', 'emoji': '🐞'},
+            {'tag': 'feature', 'emoji': '✨'},
+            {'tag': 'polish', 'emoji': '💅'},
+        ],
+        'spaces': [],
+    }
+
+    for space_idx in range(spaces):
+        is_gdd = space_idx % 2 == 0
+        space = {
+            'name': 'Game Design Documents (GDD)' if space_idx == 0 else 'Production' if space_idx == 1 else f'Space {space_idx}',
+            'icon': 'gdd' if is_gdd else 'tasks',
+            'defaultDeckType': 'hero' if is_gdd else 'task',
+            'decks': [],
+        }
+        for deck_idx in range(decks):
+            if is_gdd:
+                deck_type = 'doc' if deck_idx == decks - 1 else 'hero'
+                name = 'Design Notes' if deck_type == 'doc' else f'Hero Deck {deck_idx + 1}'
+            else:
+                deck_type = 'task'
+                name = 'Bugs & QA' if deck_idx == decks - 1 else f'Task Deck {deck_idx + 1}'
+            deck = {
+                'id': f's{space_idx}d{deck_idx}',
+                'name': name,
+                'description': make_content(rng, 80),
+                'deckType': deck_type,
+                'coverFileUrl': f'https://uploads.codecks.io/bench/{space_idx}-{deck_idx}.png',
+            }
+            if deck_type == 'task':
+                deck['preferredOrder'] = 'priority'
+            if name == 'Bugs & QA':
+                deck['autoTag'] = 'bug'
+            if deck_type == 'hero':
+                deck['journey'] = {'steps': [
+                    {
+                        'content': make_content(rng, 60),
+                        'targetDeck': None,
+                        'priority': 'b',
+                        'effort': rng.choice([1, 2, 3, None]),
+                        'tags': [],
+                    }
+                    for _ in range(steps)
+                ]}
+            deck['cards'] = [
+                {
+                    'id': f's{space_idx}d{deck_idx}c{card_idx}',
+                    'content': make_content(rng, content_length),
+                    'priority': rng.choice(['a', 'b', 'c']),
+                    'effort': rng.choice([1, 2, 3, 5, 8, None]),
+                    'tags': rng.sample(['feature', 'polish'], k=rng.randint(0, 2)),
+                    'isDoc': deck_type == 'doc',
+                    'subCards': [],
+                }
+                for card_idx in range(cards)
+            ]
+            space['decks'].append(deck)
+        template['spaces'].append(space)
+
+    return template
+
+def make_icon(path: Path, size: int = 512):
+    """Draw a white-on-transparent icon like the game-icons.net set."""
+    from PIL import Image, ImageDraw
+
+    icon = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(icon)
+    draw.ellipse((size * 0.15, size * 0.15, size * 0.85, size * 0.85), outline=(255, 255, 255, 255), width=size // 12)
+    draw.polygon([(size * 0.5, size * 0.25), (size * 0.7, size * 0.7), (size * 0.3, size * 0.7)], fill=(255, 255, 255, 255))
+    icon.save(path, 'PNG')
+
+def quiet(func: Callable):
+    """Call `func` with stdout silenced."""
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        func()
+
+def time_call(func: Callable, repeat: int) -> List[float]:
+    """Run `func` `repeat` times and return the wall times in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def summarize(benchmark: str, scale: str, params: Dict, timings: List[float], items: int, unit: str) -> Dict:
+    """Build one result record."""
+    best = min(timings)
+    return {
+        'benchmark': benchmark,
+        'scale': scale,
+        'params': params,
+        'seconds_min': round(best, 6),
+        'seconds_median': round(statistics.median(timings), 6),
+        'items': items,
+        'unit': unit,
+        'items_per_second': round(items / best, 1) if best > 0 else None,
+    }
+
+def run_benchmarks(scales: List[str], repeat: int, workdir: Path) -> List[Dict]:
+    """Run every benchmark at every scale."""
+    validator = load_script('validate_templates', 'validate-templates.py')
+    try:
+        import ijson  # noqa: F401
+        has_ijson = True
+    except ImportError:
+        has_ijson = False
+    try:
+        images = load_script('create_deck_images', 'create_deck_images.py')
+    except ImportError:
+        images = None
+        print("⚠️  Pillow not installed, skipping image benchmarks")
+
+    results = []
+    for scale in scales:
+        params = SCALES[scale]
+        template = generate_template(**params)
+        path = workdir / f'{scale}.json'
+        with open(path, 'w') as f:
+            json.dump(template, f, indent=2, ensure_ascii=False)
+        card_count = params['spaces'] * params['decks'] * params['cards']
+        file_params = dict(params, bytes=path.stat().st_size)
+        print(f"📏 {scale}: {card_count} cards, {file_params['bytes'] / 1024:.0f} KiB")
+
+        timings = time_call(lambda: validator.validate_template(path), repeat)
+        results.append(summarize('validate', scale, file_params, timings, card_count, 'cards'))
+
+        if has_ijson:
+            timings = time_call(lambda: validator.validate_template(path, stream=True), repeat)
+            results.append(summarize('validate-stream', scale, file_params, timings, card_count, 'cards'))
+
+        if images is not None:
+            icon_path = workdir / 'icon.png'
+            if not icon_path.exists():
+                make_icon(icon_path)
+            deck_count = params['spaces'] * params['decks']
+            out_dir = workdir / f'{scale}-images'
+            out_dir.mkdir(exist_ok=True)
+
+            def render():
+                for idx in range(deck_count):
+                    images.create_deck_image(str(icon_path), out_dir / f'{idx}.png')
+
+            # The image script reports every file it writes; keep the benchmark output readable
+            timings = time_call(lambda: quiet(render), repeat)
+            results.append(summarize('deck-images', scale, {'decks': deck_count}, timings, deck_count, 'images'))
+
+    return results
+
+def git_commit() -> str:
+    """Return the current commit hash, or 'unknown' outside of git."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            check=True, capture_output=True, text=True, cwd=SCRIPTS_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def print_results(results: List[Dict], baseline: Dict = None):
+    """Print a results table, with the change against a baseline if given."""
+    previous = {}
+    if baseline:
+        previous = {(r['benchmark'], r['scale']): r for r in baseline.get('results', [])}
+
+    print(f"\n{'benchmark':<18} {'scale':<8} {'min (s)':>10} {'median (s)':>11} {'rate':>16}  change")
+    for r in results:
+        rate = f"{r['items_per_second']:.0f} {r['unit']}/s" if r['items_per_second'] else '-'
+        change = ''
+        old = previous.get((r['benchmark'], r['scale']))
+        if old and old['seconds_min'] > 0:
+            ratio = r['seconds_min'] / old['seconds_min']
+            marker = '🐢' if ratio > 1.1 else '🚀' if ratio < 0.9 else '  '
+            change = f"{marker} {ratio:.2f}x vs {baseline.get('commit', '?')}"
+        print(f"{r['benchmark']:<18} {r['scale']:<8} {r['seconds_min']:>10.4f} {r['seconds_median']:>11.4f} {rate:>16}  {change}")
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the template scripts on synthetic templates.")
+    parser.add_argument(
+        '--scales', default='small,medium,large',
+        help=f"Comma-separated scales to run (available: {', '.join(SCALES)})",
+    )
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per benchmark (default: 3)")
+    parser.add_argument(
+        '-o', '--output', type=Path, default=Path('benchmark-results.json'),
+        help="Where to write results (default: benchmark-results.json)",
+    )
+    parser.add_argument('--compare', type=Path, help="Previous results file to compare against")
+    parser.add_argument(
+        '--generate', type=Path, metavar='DIR',
+        help="Only write the synthetic templates to DIR (e.g. to validate them with other flags)",
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the benchmarks."""
+    args = parse_args(argv)
+    scales = [s.strip() for s in args.scales.split(',') if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        print(f"Error: unknown scale(s): {', '.join(unknown)}")
+        return 1
+
+    if args.generate:
+        args.generate.mkdir(parents=True, exist_ok=True)
+        for scale in scales:
+            path = args.generate / f'{scale}.json'
+            with open(path, 'w') as f:
+                json.dump(generate_template(**SCALES[scale]), f, indent=2, ensure_ascii=False)
+            print(f"✓ Created {path}")
+        return 0
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    with tempfile.TemporaryDirectory(prefix='template-bench-') as tmp:
+        results = run_benchmarks(scales, args.repeat, Path(tmp))
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print_results(results, baseline)
+    print(f"\n✅ Results written to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
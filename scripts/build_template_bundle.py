@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Compile templates into a minified bundle, a content-hash index and a delta.
+
+Writes to the output directory:
+- bundle.json: every template, minified, keyed by "<org>/<template>"
+- index.json: sha256 and size of every template
+- delta.json: only the templates whose hash differs from --previous-index,
+  plus the ids that were removed
+
+With --endpoint the delta is POSTed, so a sync only sends what changed.
+
+Usage:
+    python3 scripts/build_template_bundle.py
+    python3 scripts/build_template_bundle.py --previous-index last/index.json
+    python3 scripts/build_template_bundle.py --previous-index last/index.json \\
+        --endpoint "$API_HOST/templates/sync"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from http_pool import ConnectionPool
+
+BUNDLE_VERSION = 1
+
+def template_id(path: Path, root: Path) -> str:
+    """'templates/cdx/rpg.json' -> 'cdx/rpg', matching the org/template pair the API uses."""
+    return path.relative_to(root).with_suffix('').as_posix()
+
+def minify(data) -> str:
+    """Compact JSON; key order is kept so hashes follow the file, not a re-sort."""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+def compile_templates(root: Path) -> Dict[str, str]:
+    """Minified JSON of every template under root, by template id."""
+    templates = {}
+    for path in sorted(root.glob('**/*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            templates[template_id(path, root)] = minify(json.load(f))
+    return templates
+
+def build_index(templates: Dict[str, str]) -> Dict[str, Dict]:
+    """Content hash and size of each minified template."""
+    index = {}
+    for tid, text in templates.items():
+        data = text.encode('utf-8')
+        index[tid] = {'sha256': hashlib.sha256(data).hexdigest(), 'bytes': len(data)}
+    return index
+
+def index_digest(index: Dict[str, Dict]) -> str:
+    """One hash for a whole index, so the server can tell which state a delta applies to."""
+    return hashlib.sha256(json.dumps(index, sort_keys=True).encode()).hexdigest()
+
+def build_delta(templates: Dict[str, str], index: Dict[str, Dict], previous: Optional[Dict[str, Dict]]) -> str:
+    """
+    Minified delta payload against a previous index.
+
+    Without a previous index every template is included.
+    """
+    previous = previous or {}
+    changed = [
+        tid for tid, entry in index.items()
+        if previous.get(tid, {}).get('sha256') != entry['sha256']
+    ]
+    removed = sorted(set(previous) - set(index))
+    # Templates are spliced in as already-minified text instead of being parsed again
+    parts = [f'{json.dumps(tid)}:{templates[tid]}' for tid in changed]
+    return (
+        f'{{"version":{BUNDLE_VERSION},'
+        f'"base":{json.dumps(index_digest(previous) if previous else None)},'
+        f'"target":{json.dumps(index_digest(index))},'
+        f'"templates":{{{",".join(parts)}}},'
+        f'"removed":{json.dumps(removed)}}}'
+    )
+
+def build_bundle(templates: Dict[str, str], index: Dict[str, Dict]) -> str:
+    """Minified bundle of every template."""
+    parts = [f'{json.dumps(tid)}:{text}' for tid, text in templates.items()]
+    return f'{{"version":{BUNDLE_VERSION},"target":{json.dumps(index_digest(index))},"templates":{{{",".join(parts)}}}}}'
+
+def post_delta(endpoint: str, payload: str, token: Optional[str], timeout: float, retries: int) -> Optional[int]:
+    """POST the delta and report the response. Returns the HTTP status, or None if there was no response."""
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    try:
+        with ConnectionPool(timeout=timeout, retries=retries) as pool:
+            response = pool.request('POST', endpoint, body=payload.encode('utf-8'), headers=headers)
+    except (OSError, ValueError) as e:
+        print(f"❌ Sync failed: {e}")
+        return None
+    body = response.body.decode('utf-8', errors='replace').strip()
+    if response.status in (200, 202):
+        print(f"✅ Sync triggered successfully (HTTP {response.status})")
+        if body:
+            print(f"Response: {body}")
+    else:
+        print(f"❌ Sync failed (HTTP {response.status})")
+        if body:
+            print(f"Error: {body}")
+    return response.status
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Build a minified template bundle, hash index and delta.")
+    parser.add_argument('--templates', type=Path, default=Path('templates'), help="Template directory (default: templates)")
+    parser.add_argument('-o', '--output-dir', type=Path, default=Path('dist'), help="Where to write the files (default: dist)")
+    parser.add_argument('--previous-index', type=Path, help="index.json from the last sync; the delta holds only what changed")
+    parser.add_argument('--endpoint', help="POST the delta here, e.g. $API_HOST/templates/sync")
+    parser.add_argument('--token-env', default='API_TOKEN', help="Environment variable with the bearer token (default: API_TOKEN)")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Seconds for the POST (default: 30)")
+    parser.add_argument('--retries', type=int, default=3, help="Retries on errors and 5xx (default: 3)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Build the bundle and optionally send the delta."""
+    args = parse_args(argv)
+
+    templates = compile_templates(args.templates)
+    index = build_index(templates)
+
+    previous = None
+    if args.previous_index:
+        try:
+            with open(args.previous_index) as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: could not read previous index {args.previous_index}: {e}")
+            return 1
+
+    bundle = build_bundle(templates, index)
+    delta = build_delta(templates, index, previous)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    outputs = {
+        'bundle.json': bundle,
+        'index.json': json.dumps(index, indent=2, sort_keys=True),
+        'delta.json': delta,
+    }
+    for name, text in outputs.items():
+        with open(args.output_dir / name, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    source_bytes = sum(p.stat().st_size for p in args.templates.glob('**/*.json'))
+    delta_count = len(json.loads(delta)['templates'])
+    print(f"📦 {len(templates)} templates: {source_bytes / 1024:.0f} KiB source, "
+          f"{len(bundle.encode()) / 1024:.0f} KiB bundle")
+    if previous is None:
+        print(f"   No previous index: delta has all {delta_count} templates ({len(delta.encode()) / 1024:.0f} KiB)")
+    else:
+        print(f"   Delta: {delta_count} changed, {len(json.loads(delta)['removed'])} removed "
+              f"({len(delta.encode()) / 1024:.1f} KiB)")
+    print(f"✅ Wrote {', '.join(outputs)} to {args.output_dir}/")
+
+    if args.endpoint:
+        status = post_delta(args.endpoint, delta, os.environ.get(args.token_env), args.timeout, args.retries)
+        if status not in (200, 202):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
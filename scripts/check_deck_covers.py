@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Check that deck covers resolve and agree across the three places they live.
+
+Sources:
+- coverFileUrl of every deck in templates/**/*.json
+- the uploaded URLs listed in deck_images.txt
+- the rendered files in generated_deck_images/
+
+Every distinct URL gets a HEAD request. Requests run concurrently over
+pooled keep-alive connections, and good results are cached. Use --base-url
+to point all requests at another server, e.g. a local stub.
+
+Usage:
+    python3 scripts/check_deck_covers.py
+    python3 scripts/check_deck_covers.py --jobs 32 --no-cache
+    python3 scripts/check_deck_covers.py --base-url http://localhost:8000
+"""
+
+import argparse
+import http.client
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from http_pool import ConnectionPool
+
+DEFAULT_CACHE_FILE = Path('.check-deck-covers-cache.json')
+
+# "- Deck Name: https://..." lines under "## Template" headings
+DECK_IMAGE_LINE = re.compile(r'^-\s+(?P<deck>.+?):\s+(?P<url>https?://\S+)\s*$')
+
+class CoverRef(NamedTuple):
+    source: str  # e.g. 'templates/cdx/rpg.json' or 'deck_images.txt (Fantasy RPG Project)'
+    deck: str
+    url: str
+
+class UrlCheck(NamedTuple):
+    ok: bool
+    status: Optional[int]
+    content_type: str
+    error: str
+
+def cover_slug(url_or_name: str) -> str:
+    """File name without punctuation, so 'items-&-power-ups.png' matches 'items-power-ups.png'."""
+    stem = Path(urlsplit(url_or_name).path).stem
+    return re.sub(r'[^a-z0-9]+', '-', stem.lower()).strip('-')
+
+def template_covers(template_dir: Path) -> List[CoverRef]:
+    """Every deck's coverFileUrl in every template."""
+    refs = []
+    for path in sorted(template_dir.glob('**/*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            template = json.load(f)
+        for space in template.get('spaces', []):
+            for deck in space.get('decks', []):
+                if deck.get('coverFileUrl'):
+                    refs.append(CoverRef(str(path), deck.get('name', ''), deck['coverFileUrl']))
+    return refs
+
+def deck_image_list(path: Path) -> List[CoverRef]:
+    """The uploaded cover URLs listed in deck_images.txt."""
+    refs = []
+    section = ''
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if line.startswith('## '):
+                section = line[3:].strip()
+                continue
+            match = DECK_IMAGE_LINE.match(line)
+            if match:
+                refs.append(CoverRef(f"{path.name} ({section})", match['deck'], match['url']))
+    return refs
+
+def rebase_url(url: str, base_url: Optional[str]) -> str:
+    """Send `url` to `base_url` instead of its own host, keeping the path."""
+    if not base_url:
+        return url
+    base = urlsplit(base_url)
+    parts = urlsplit(url)
+    return urlunsplit((base.scheme, base.netloc, base.path.rstrip('/') + parts.path, parts.query, ''))
+
+class CheckCache:
+    """Good HEAD results by URL; failures are always checked again."""
+
+    def __init__(self, path: Optional[Path], ttl_hours: float):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.entries = {}
+        if path is None:
+            return
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def get(self, url: str) -> Optional[UrlCheck]:
+        entry = self.entries.get(url)
+        if not entry or time.time() - entry['checked'] > self.ttl:
+            return None
+        return UrlCheck(True, entry['status'], entry['content_type'], '')
+
+    def put(self, url: str, check: UrlCheck):
+        if check.ok:
+            self.entries[url] = {'status': check.status, 'content_type': check.content_type, 'checked': time.time()}
+
+    def save(self):
+        if self.path is None:
+            return
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+def check_url(pool: ConnectionPool, url: str) -> UrlCheck:
+    """HEAD a cover URL; it must answer 200 with an image content type."""
+    try:
+        response = pool.request('HEAD', url)
+        if response.status in (405, 501):
+            # Some hosts don't do HEAD; ask for the first byte instead
+            response = pool.request('GET', url, headers={'Range': 'bytes=0-0'})
+    except (OSError, ValueError, http.client.HTTPException) as e:
+        return UrlCheck(False, None, '', str(e))
+
+    content_type = response.headers.get('content-type', '')
+    if response.status not in (200, 206):
+        return UrlCheck(False, response.status, content_type, f"HTTP {response.status}")
+    if not content_type.startswith('image/'):
+        return UrlCheck(False, response.status, content_type, f"not an image ({content_type or 'no content type'})")
+    return UrlCheck(True, response.status, content_type, '')
+
+def check_urls(urls: List[str], jobs: int, timeout: float, retries: int, cache: CheckCache) -> Tuple[Dict[str, UrlCheck], int]:
+    """Check every URL, cached ones first. Returns (results, connections opened)."""
+    results = {}
+    pending = []
+    for url in urls:
+        cached = cache.get(url)
+        if cached:
+            results[url] = cached
+        else:
+            pending.append(url)
+
+    print(f"🔎 Checking {len(urls)} cover URLs ({len(urls) - len(pending)} cached) with up to {jobs} connections...")
+    with ConnectionPool(timeout=timeout, retries=retries) as pool:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            for url, check in zip(pending, executor.map(lambda u: check_url(pool, u), pending)):
+                results[url] = check
+                cache.put(url, check)
+        opened = pool.connections_opened
+    return results, opened
+
+def cross_reference(template_refs: List[CoverRef], listed_refs: List[CoverRef],
+                    generated: Optional[List[str]]) -> Tuple[List[str], List[str]]:
+    """Compare the three sources. Returns (errors, warnings)."""
+    errors = []
+    warnings = []
+
+    listed_urls = {ref.url for ref in listed_refs}
+    listed_by_slug = {}
+    for ref in listed_refs:
+        listed_by_slug.setdefault(cover_slug(ref.url), set()).add(ref.url)
+    listed_hosts = {urlsplit(url).netloc for url in listed_urls}
+
+    # Template covers on the upload host should be the ones deck_images.txt lists
+    for ref in template_refs:
+        if ref.url in listed_urls or urlsplit(ref.url).netloc not in listed_hosts:
+            continue
+        others = listed_by_slug.get(cover_slug(ref.url))
+        if others:
+            errors.append(f"{ref.source}: {ref.deck} uses {ref.url}, but deck_images.txt lists {', '.join(sorted(others))}")
+        else:
+            warnings.append(f"{ref.source}: {ref.deck} uses {ref.url}, which deck_images.txt doesn't list")
+
+    used = {ref.url for ref in template_refs}
+    for url in sorted(listed_urls - used):
+        warnings.append(f"deck_images.txt: {url} is not used by any template")
+
+    if generated is not None:
+        rendered = {cover_slug(name) for name in generated}
+        for slug, urls in sorted(listed_by_slug.items()):
+            if slug not in rendered:
+                warnings.append(f"deck_images.txt: no generated image for {', '.join(sorted(urls))}")
+        for name in sorted(generated):
+            if cover_slug(name) not in listed_by_slug:
+                warnings.append(f"generated_deck_images/{name} is not listed in deck_images.txt (not uploaded?)")
+
+    return errors, warnings
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Check deck cover URLs and cross-reference their sources.")
+    parser.add_argument('--templates', type=Path, default=Path('templates'), help="Template directory (default: templates)")
+    parser.add_argument('--deck-images', type=Path, default=Path('deck_images.txt'), help="Uploaded cover list (default: deck_images.txt)")
+    parser.add_argument(
+        '--generated', type=Path, default=Path('generated_deck_images'),
+        help="Rendered covers (default: generated_deck_images, skipped if missing)",
+    )
+    parser.add_argument('--base-url', help="Send every request to this server instead, keeping URL paths")
+    parser.add_argument('-j', '--jobs', type=int, default=16, help="Concurrent connections (default: 16)")
+    parser.add_argument('--timeout', type=float, default=10.0, help="Seconds per request (default: 10)")
+    parser.add_argument('--retries', type=int, default=2, help="Retries per URL on errors and 5xx (default: 2)")
+    parser.add_argument('--cache-file', type=Path, default=DEFAULT_CACHE_FILE, help=f"Result cache (default: {DEFAULT_CACHE_FILE})")
+    parser.add_argument('--cache-ttl', type=float, default=24.0, help="Hours a good result stays cached (default: 24)")
+    parser.add_argument('--no-cache', action='store_true', help="Check every URL again and leave the cache alone")
+    parser.add_argument('--offline', action='store_true', help="Only cross-reference the sources, no requests")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Check all deck covers."""
+    args = parse_args(argv)
+
+    template_refs = template_covers(args.templates)
+    listed_refs = deck_image_list(args.deck_images) if args.deck_images.exists() else []
+    generated = None
+    if args.generated.is_dir():
+        generated = [p.name for p in args.generated.glob('*.png') if '@' not in p.name and not p.name.startswith('atlas')]
+
+    errors, warnings = cross_reference(template_refs, listed_refs, generated)
+
+    if not args.offline:
+        users = {}
+        for ref in template_refs + listed_refs:
+            users.setdefault(ref.url, []).append(ref)
+        cache = CheckCache(None if args.no_cache else args.cache_file, args.cache_ttl)
+        requested = {url: rebase_url(url, args.base_url) for url in users}
+        results, opened = check_urls(sorted(set(requested.values())), args.jobs, args.timeout, args.retries, cache)
+        cache.save()
+        print(f"   {opened} connections opened")
+
+        for url, refs in users.items():
+            check = results[requested[url]]
+            if not check.ok:
+                where = ', '.join(sorted({f"{Path(ref.source).name}: {ref.deck}" for ref in refs}))
+                errors.append(f"{url}: {check.error} (used by {where})")
+
+    print(f"\n📋 {len(template_refs)} template decks, {len(listed_refs)} listed uploads, "
+          f"{len(generated) if generated is not None else 'no'} generated images")
+    for message in errors:
+        print(f"❌ {message}")
+    for message in warnings:
+        print(f"⚠️  {message}")
+
+    if errors:
+        print(f"\n❌ {len(errors)} cover problems found")
+        return 1
+    print("\n✅ All deck covers resolve" if not args.offline else "\n✅ Sources agree")
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
@@ -9,9 +9,23 @@ This script:
 3. Adds purple gradient background
 4. Adds glow effect for visual appeal
 """
-from PIL import Image, ImageDraw, ImageFilter, ImageEnhance
+from PIL import Image, ImageDraw, ImageFilter, ImageEnhance, features
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import urlparse
+import argparse
+import hashlib
 import json
+import math
+import os
+import re
+import shutil
+import time
+
+from check_deck_covers import cover_slug
+from profiling import PROFILER, Profiler
 
 # Icon mapping for each deck type
 ICON_MAPPINGS = {
@@ -75,14 +89,26 @@ ICON_MAPPINGS = {
     'Design Notes': 'icons/ffffff/transparent/1x1/delapouite/notebook.png',
 }
 
+DECK_IMAGE_SIZE = (147, 104)
+GLOW_RADIUS = 4
+
+# Bump when rendering changes in a way the render parameters don't capture
+RENDER_VERSION = 1
+
+# Local build state; kept out of the committed output directory (see .gitignore)
+BUILD_MANIFEST_FILE = Path('.deck-images-manifest.json')
+
+# Deeper, richer purple gradient with more range
+GRADIENT_TOP = (30, 10, 60)       # Deep dark purple/navy
+GRADIENT_BOTTOM = (90, 40, 140)   # Rich medium purple
+
 def create_gradient_background(width, height):
     """Create a deep purple gradient background with more range."""
     img = Image.new('RGB', (width, height))
     draw = ImageDraw.Draw(img)
 
-    # Deeper, richer purple gradient with more range
-    top_color = (30, 10, 60)       # Deep dark purple/navy
-    bottom_color = (90, 40, 140)   # Rich medium purple
+    top_color = GRADIENT_TOP
+    bottom_color = GRADIENT_BOTTOM
 
     for y in range(height):
         # Interpolate between top and bottom colors
@@ -94,6 +120,11 @@ def create_gradient_background(width, height):
 
     return img
 
+@lru_cache(maxsize=8)
+def cached_gradient_background(width, height):
+    """RGBA gradient built once per size. Callers must copy() before drawing on it."""
+    return create_gradient_background(width, height).convert('RGBA')
+
 def add_glow_effect(icon, glow_radius=3, glow_color=(255, 255, 255)):
     """Add a glow effect around the icon."""
     # Create a larger canvas for the glow
@@ -125,106 +156,675 @@ def get_icon_author(icon_path):
         return path_parts[4]
     return "Unknown"
 
-def create_deck_image(icon_path, output_path, target_size=(147, 104)):
+# Output profiles: (variant name, file suffix, scale, format) per file written.
+# 'png' is the original single unoptimized PNG.
+OUTPUT_PROFILES = {
+    'png': [
+        ('png@1x', '.png', 1, 'png'),
+    ],
+    'web': [
+        ('png@1x', '.png', 1, 'png-quantized'),
+        ('png@2x', '@2x.png', 2, 'png-quantized'),
+        ('webp@1x', '.webp', 1, 'webp'),
+        ('webp@2x', '@2x.webp', 2, 'webp'),
+        ('avif@1x', '.avif', 1, 'avif'),
+        ('avif@2x', '@2x.avif', 2, 'avif'),
+    ],
+}
+
+MIME_TYPES = {'png': 'image/png', 'png-quantized': 'image/png', 'webp': 'image/webp', 'avif': 'image/avif'}
+
+COVERS_MANIFEST_NAME = 'covers-manifest.json'
+
+def format_supported(fmt):
+    """Whether this Pillow build can write the format."""
+    if fmt in ('webp', 'avif'):
+        return features.check(fmt)
+    return True
+
+def variant_paths(output_path, profile):
     """
-    Create a deck image from an icon.
+    Files written for one deck under a profile.
+
+    Returns (variant name, path, scale, format) tuples; the first one is
+    always output_path itself. Formats this Pillow can't write are skipped.
+    """
+    output_path = Path(output_path)
+    stem = output_path.with_suffix('')
+    return [
+        (name, Path(f"{stem}{suffix}"), scale, fmt)
+        for name, suffix, scale, fmt in OUTPUT_PROFILES[profile]
+        if format_supported(fmt)
+    ]
+
+def save_variant(image, path, fmt):
+    """Save a rendered image in one of the output formats."""
+    if fmt == 'png':
+        image.save(path, 'PNG')
+    elif fmt == 'png-quantized':
+        # Gradient plus a white icon fits comfortably in a 256 color palette
+        image.quantize(colors=256, method=Image.Quantize.FASTOCTREE).save(path, 'PNG', optimize=True)
+    elif fmt == 'webp':
+        image.save(path, 'WEBP', quality=90, method=6)
+    elif fmt == 'avif':
+        image.save(path, 'AVIF', quality=75)
+    else:
+        raise ValueError(f"Unknown output format: {fmt}")
+
+def write_covers_manifest(output_dir, outputs, profile):
+    """
+    Write byte sizes of every variant per deck cover.
+
+    Lets a server pick the smallest format each client accepts.
+    """
+    covers = {}
+    for output_path in outputs:
+        variants = {}
+        for name, path, scale, fmt in variant_paths(output_path, profile):
+            variants[name] = {
+                'file': path.name,
+                'mime': MIME_TYPES[fmt],
+                'width': DECK_IMAGE_SIZE[0] * scale,
+                'height': DECK_IMAGE_SIZE[1] * scale,
+                'bytes': path.stat().st_size,
+            }
+        covers[Path(output_path).stem] = variants
+
+    with open(Path(output_dir) / COVERS_MANIFEST_NAME, 'w') as f:
+        json.dump({'profile': profile, 'covers': covers}, f, indent=2, sort_keys=True)
+    return covers
+
+def template_decks(template_path):
+    """(deck name, cover file name or None) for every deck in a template."""
+    with open(template_path, 'r', encoding='utf-8') as f:
+        template = json.load(f)
+
+    for space in template.get('spaces', []):
+        for deck in space.get('decks', []):
+            url = deck.get('coverFileUrl')
+            yield deck.get('name', ''), Path(urlparse(url).path).name if url else None
+
+def template_cover_names(template_path):
+    """File names of the covers a template references, in deck order."""
+    names = []
+    for _, name in template_decks(template_path):
+        if name and name not in names:
+            names.append(name)
+    return names
+
+def build_atlas(covers, atlas_path, tile_size=DECK_IMAGE_SIZE):
+    """
+    Pack covers into one grid image and write its offsets manifest.
 
     Args:
-        icon_path: Path to source icon (PNG)
-        output_path: Where to save the result
-        target_size: Final image size (width, height)
+        covers: (frame name, image path) pairs; frame names are cover file
+            names, i.e. the last part of a coverFileUrl
+        atlas_path: Where to save the atlas; the manifest is written next
+            to it with a .json suffix
+    """
+    atlas_path = Path(atlas_path)
+    columns = max(1, math.ceil(math.sqrt(len(covers))))
+    rows = max(1, math.ceil(len(covers) / columns))
+    atlas = Image.new('RGBA', (columns * tile_size[0], rows * tile_size[1]), (0, 0, 0, 0))
+
+    frames = {}
+    for i, (name, cover_path) in enumerate(covers):
+        x = (i % columns) * tile_size[0]
+        y = (i // columns) * tile_size[1]
+        with Image.open(cover_path) as cover:
+            atlas.paste(cover.convert('RGBA').resize(tile_size), (x, y))
+        frames[name] = {'x': x, 'y': y, 'w': tile_size[0], 'h': tile_size[1]}
+
+    atlas.save(atlas_path, 'PNG', optimize=True)
+    manifest = {
+        'image': atlas_path.name,
+        'width': atlas.width,
+        'height': atlas.height,
+        'frames': frames,
+    }
+    with open(atlas_path.with_suffix('.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def file_sha256(path):
+    """Hex SHA-256 of a file's contents."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+def render_key(icon_path, target_size=DECK_IMAGE_SIZE, profile='png'):
+    """
+    Content address of a rendered deck image.
 
-    Returns:
-        Author name for attribution
+    Covers the source icon bytes and every render parameter, so two decks
+    with the same key produce byte-identical images.
     """
-    # Load icon
-    icon = Image.open(icon_path).convert('RGBA')
+    params = {
+        'version': RENDER_VERSION,
+        'size': list(target_size),
+        'glow_radius': GLOW_RADIUS,
+        'gradient': [list(GRADIENT_TOP), list(GRADIENT_BOTTOM)],
+        'profile': [variant[1:] for variant in OUTPUT_PROFILES[profile] if format_supported(variant[3])],
+    }
+    digest = hashlib.sha256(Path(icon_path).read_bytes())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    return digest.hexdigest()
+
+class BuildManifest:
+    """
+    Render key and output hash of every image from the last build.
 
+    An output is up to date when its stored key matches the current key and
+    the file on disk still has the hash that was written.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.outputs = {}
+        try:
+            with open(self.path) as f:
+                self.outputs = json.load(f).get('outputs', {})
+        except (OSError, ValueError):
+            pass
+
+    def is_current(self, output_path, key):
+        entry = self.outputs.get(Path(output_path).name)
+        if not entry or entry.get('key') != key or not Path(output_path).exists():
+            return False
+        return file_sha256(output_path) == entry.get('sha256')
+
+    def record(self, output_path, key, icon_path):
+        self.outputs[Path(output_path).name] = {
+            'key': key,
+            'icon': str(icon_path),
+            'sha256': file_sha256(output_path),
+        }
+
+    def save(self):
+        # Group outputs by image content, so uploads can skip duplicates
+        distinct = {}
+        for name, entry in sorted(self.outputs.items()):
+            distinct.setdefault(entry['sha256'], []).append(name)
+        with open(self.path, 'w') as f:
+            json.dump({'outputs': self.outputs, 'distinct': distinct}, f, indent=2, sort_keys=True)
+
+def render_deck_image(icon, target_size=DECK_IMAGE_SIZE, glow_radius=GLOW_RADIUS):
+    """
+    Render a deck image from a loaded RGBA icon.
+
+    Returns the RGBA image; nothing is written to disk.
+    """
     # Scale icon to fit nicely (about 60% of target height)
     icon_height = int(target_size[1] * 0.6)
     aspect_ratio = icon.width / icon.height
     icon_width = int(icon_height * aspect_ratio)
-    icon = icon.resize((icon_width, icon_height), Image.Resampling.LANCZOS)
+    with PROFILER.stage('resize'):
+        icon = icon.resize((icon_width, icon_height), Image.Resampling.LANCZOS)
 
     # Add glow effect
-    icon_with_glow = add_glow_effect(icon, glow_radius=4)
+    with PROFILER.stage('glow'):
+        icon_with_glow = add_glow_effect(icon, glow_radius=glow_radius)
 
     # Create gradient background
-    background = create_gradient_background(target_size[0], target_size[1])
-    background = background.convert('RGBA')
+    with PROFILER.stage('background'):
+        background = cached_gradient_background(target_size[0], target_size[1]).copy()
 
     # Center the icon
     x = (target_size[0] - icon_with_glow.width) // 2
     y = (target_size[1] - icon_with_glow.height) // 2
 
     # Composite icon onto background
-    background.paste(icon_with_glow, (x, y), icon_with_glow)
+    with PROFILER.stage('composite'):
+        background.paste(icon_with_glow, (x, y), icon_with_glow)
+    return background
+
+def create_deck_image(icon_path, output_path, target_size=DECK_IMAGE_SIZE, verbose=True, profile='png'):
+    """
+    Create a deck image from an icon.
+
+    Args:
+        icon_path: Path to source icon (PNG)
+        output_path: Where to save the result
+        target_size: Final image size (width, height)
+        verbose: Print a line for the created file
+        profile: Output profile from OUTPUT_PROFILES; 'web' also writes
+            @2x, WebP and AVIF variants next to output_path
+
+    Returns:
+        Author name for attribution
+    """
+    # Load icon
+    with PROFILER.stage('open'):
+        icon = Image.open(icon_path).convert('RGBA')
+
+    renders = {}
+    for _, path, scale, fmt in variant_paths(output_path, profile):
+        if scale not in renders:
+            size = (target_size[0] * scale, target_size[1] * scale)
+            renders[scale] = render_deck_image(icon, size, glow_radius=GLOW_RADIUS * scale)
+        with PROFILER.stage(f'save-{fmt}'):
+            save_variant(renders[scale], path, fmt)
 
-    # Save as PNG
-    background.save(output_path, 'PNG')
-    print(f"✓ Created {output_path}")
+    if verbose:
+        print(f"✓ Created {output_path}")
 
     return get_icon_author(icon_path)
 
+
+ICON_BASE_PATH = Path('icons/ffffff/transparent/1x1')
+ICON_INDEX_FILE = Path('.icon-index.json')
+
+class IconIndex:
+    """
+    Index of icon stem, author and path for the icon set.
+
+    Saved to disk and reused while the base directory and every author
+    directory keep their mtime (adding or removing an icon changes its
+    author directory's mtime), so the tree is walked at most once.
+    """
+
+    def __init__(self, base_path=ICON_BASE_PATH, index_file=ICON_INDEX_FILE):
+        self.base_path = Path(base_path)
+        self.index_file = Path(index_file)
+        self.entries = []   # [stem, author, path], sorted by path
+        self.by_stem = {}   # lowercase stem -> first path with that stem
+        self.load()
+
+    def signature(self):
+        """mtimes of the base directory and each author directory."""
+        if not self.base_path.is_dir():
+            return {}
+        signature = {'.': self.base_path.stat().st_mtime_ns}
+        with os.scandir(self.base_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    signature[entry.name] = entry.stat().st_mtime_ns
+        return signature
+
+    def load(self):
+        """Load the saved index, rebuilding it if the icon tree changed."""
+        signature = self.signature()
+        try:
+            with open(self.index_file) as f:
+                data = json.load(f)
+            if data.get('base') == str(self.base_path) and data.get('signature') == signature:
+                self.set_entries(data['entries'])
+                return
+        except (OSError, ValueError, KeyError):
+            pass
+        self.rebuild(signature)
+
+    def rebuild(self, signature):
+        """Walk the icon tree once and save the index."""
+        entries = []
+        if self.base_path.is_dir():
+            for icon_file in self.base_path.rglob('*.png'):
+                entries.append([icon_file.stem, get_icon_author(icon_file), str(icon_file)])
+        entries.sort(key=lambda entry: entry[2])
+        self.set_entries(entries)
+
+        try:
+            with open(self.index_file, 'w') as f:
+                json.dump({'base': str(self.base_path), 'signature': signature, 'entries': entries}, f)
+        except OSError as e:
+            print(f"⚠️  Could not save icon index: {e}")
+
+    def set_entries(self, entries):
+        self.entries = entries
+        self.by_stem = {}
+        for stem, _, path in entries:
+            self.by_stem.setdefault(stem.lower(), path)
+
+    def exact(self, stem):
+        """Path of the first icon whose name is exactly `stem`."""
+        return self.by_stem.get(stem.lower())
+
+    def partial(self, fragment):
+        """Path of the first icon whose name contains `fragment`."""
+        fragment = fragment.lower()
+        for stem, _, path in self.entries:
+            if fragment in stem.lower():
+                return path
+        return None
+
+@lru_cache(maxsize=1)
+def get_icon_index():
+    """The icon index, loaded once per run."""
+    return IconIndex()
+
 def find_icon(pattern):
     """Find an icon file matching the pattern."""
-    base_path = Path('icons/ffffff/transparent/1x1')
+    index = get_icon_index()
+
+    # Try exact match first, then partial match
+    return index.exact(pattern) or index.partial(pattern)
+
+def resolve_icon(icon_path):
+    """The mapped icon if it exists, else the first icon with a matching name; None if there is neither."""
+    if Path(icon_path).exists():
+        return icon_path
+    return find_icon(Path(icon_path).stem)
+
+def cover_file_name(deck_name):
+    """Output file name of a deck's cover, e.g. 'Bugs & QA' -> 'bugs-&-qa.png'."""
+    safe_name = deck_name.lower().replace(' ', '-').replace('/', '-')
+    return f"{safe_name}.png"
+
+DEFAULT_TEMPLATE_DIR = Path('templates/cdx')
 
-    # Try exact match first
-    for icon_file in base_path.rglob('*.png'):
-        if pattern in str(icon_file):
-            return str(icon_file)
+class TemplatePlan:
+    """
+    Covers the templates actually reference, diffed against ICON_MAPPINGS.
+
+    A template cover is this script's when its slug matches the
+    cover_file_name() of the deck using it; anything else (like the stock
+    CD_*.jpeg covers) is external and never rendered here.
+    """
+
+    def __init__(self, template_dir=DEFAULT_TEMPLATE_DIR):
+        self.references = {}  # cover file name -> [(template, deck name)]
+        for template_path in sorted(Path(template_dir).glob('*.json')):
+            for deck_name, cover in template_decks(template_path):
+                if cover:
+                    self.references.setdefault(cover, []).append((template_path.stem, deck_name))
+        self.slugs = {cover_slug(cover) for cover in self.references}
+
+        mapped = {cover_slug(cover_file_name(deck_name)) for deck_name in ICON_MAPPINGS}
+        self.needed = [deck_name for deck_name in ICON_MAPPINGS if self.is_referenced(cover_file_name(deck_name))]
+        self.unused = [deck_name for deck_name in ICON_MAPPINGS if not self.is_referenced(cover_file_name(deck_name))]
+        self.unmapped = {}  # cover file name -> deck names without an ICON_MAPPINGS entry
+        self.external = []
+        for cover, refs in sorted(self.references.items()):
+            if cover_slug(cover) in mapped:
+                continue
+            own = sorted({
+                deck_name for _, deck_name in refs
+                if cover_slug(cover_file_name(deck_name)) == cover_slug(cover)
+            })
+            if own:
+                self.unmapped[cover] = own
+            else:
+                self.external.append(cover)
+
+    def is_referenced(self, file_name):
+        return cover_slug(file_name) in self.slugs
+
+    def orphans(self, manifest):
+        """Outputs from earlier builds that no template references any more."""
+        return sorted(name for name in manifest.outputs if not self.is_referenced(name))
+
+def read_attributions(path):
+    """Deck name -> (author, icon name) from the credit lines of an existing ATTRIBUTIONS.txt."""
+    credits = {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return credits
+    author = None
+    for line in lines:
+        match = re.match(r'Icons by (.+):$', line)
+        if match:
+            author = match.group(1)
+            continue
+        match = re.match(r'  - (.+) \(([^()]+)\)$', line)
+        if match and author:
+            credits[match.group(1)] = (author, match.group(2))
+    return credits
+
+def collect_attributions(manifest, output_dir):
+    """
+    Icon author -> credited decks, for every cover on disk.
 
-    # Try partial match
-    pattern_lower = pattern.lower()
-    for icon_file in base_path.rglob('*.png'):
-        if pattern_lower in icon_file.stem.lower():
-            return str(icon_file)
+    Covers from earlier builds are included while their file exists, so a
+    partial build (--from-templates) keeps the credits of images it didn't
+    touch. The icon comes from the build manifest; without an entry (e.g.
+    on a fresh clone) the cover keeps its line in the existing
+    ATTRIBUTIONS.txt, or falls back to its ICON_MAPPINGS icon.
+    """
+    output_dir = Path(output_dir)
+    deck_names = {cover_file_name(deck_name): deck_name for deck_name in ICON_MAPPINGS}
+    previous = read_attributions(output_dir / 'ATTRIBUTIONS.txt')
+    attributions = {}
+    for name in sorted(set(manifest.outputs) | set(deck_names)):
+        if not (output_dir / name).exists():
+            continue
+        deck_name = deck_names.get(name, Path(name).stem)
+        entry = manifest.outputs.get(name)
+        if entry is None and deck_name in previous:
+            author, icon_name = previous[deck_name]
+        else:
+            icon_path = entry['icon'] if entry else resolve_icon(ICON_MAPPINGS[deck_name]) or ICON_MAPPINGS[deck_name]
+            author, icon_name = get_icon_author(icon_path), Path(icon_path).stem
+        attributions.setdefault(author, []).append(f"{deck_name} ({icon_name})")
+    return attributions
+
+def render_deck(task):
+    """
+    Render one deck image; runs in a worker process with --jobs.
 
-    return None
+    Args:
+        task: (icon_path, output_path, output profile, profiling)
 
-def main():
+    Returns:
+        (author, None, stats) on success, (None, error message, stats) on
+        failure; stats are the worker's profiler sections, empty unless
+        profiling
+    """
+    icon_path, output_path, profile, profiling = task
+    if profiling:
+        PROFILER.enable()
+    try:
+        return create_deck_image(icon_path, output_path, verbose=False, profile=profile), None, PROFILER.drain()
+    except Exception as e:
+        return None, str(e), PROFILER.drain()
+
+def print_plan(template_dir, template_plan, plan, current, manifest):
+    """Print the template-driven render plan."""
+    outputs = [output_path for _, _, output_path in plan if output_path is not None]
+    stale = [output_path for output_path in outputs if output_path not in current]
+    print(f"📋 Render plan for {template_dir}/")
+    print(f"   {len(plan)} covers needed: {len(stale)} to render, {len(outputs) - len(stale)} up to date")
+    for output_path in stale:
+        print(f"   ↻ {output_path.name}")
+    for deck_name, icon_path, output_path in plan:
+        if output_path is None:
+            print(f"   ✗ {deck_name}: icon not found ({icon_path})")
+
+    if template_plan.unused:
+        print(f"\n🗑️  {len(template_plan.unused)} mappings no template references:")
+        for deck_name in template_plan.unused:
+            print(f"   - {deck_name}")
+    if template_plan.unmapped:
+        print(f"\n⚠️  {len(template_plan.unmapped)} referenced covers have no ICON_MAPPINGS entry:")
+        for cover, deck_names in template_plan.unmapped.items():
+            print(f"   - {cover} ({', '.join(deck_names)})")
+    orphans = template_plan.orphans(manifest)
+    if orphans:
+        print(f"\n🧹 {len(orphans)} earlier outputs are no longer referenced:")
+        for name in orphans:
+            print(f"   - {name}")
+    print(f"\n   {len(template_plan.external)} external covers (e.g. stock CD_*.jpeg) are not rendered here")
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Create custom deck images from the icon set.")
+    parser.add_argument(
+        '--force', action='store_true',
+        help=f"Render every image again, ignoring {BUILD_MANIFEST_FILE}",
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help="Number of worker processes (default: 1, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        '--output-profile', choices=sorted(OUTPUT_PROFILES), default='png',
+        help="png: one PNG per deck (default); web: quantized PNG, WebP and AVIF at 1x and @2x",
+    )
+    parser.add_argument(
+        '--atlas', action='store_true',
+        help="Also pack all covers into atlas.png with offsets in atlas.json",
+    )
+    parser.add_argument(
+        '--atlas-template', action='append', type=Path, default=[], metavar='TEMPLATE',
+        help="Pack only the covers this template uses into atlas-<name>.png (repeatable)",
+    )
+    parser.add_argument(
+        '--from-templates', nargs='?', const=DEFAULT_TEMPLATE_DIR, type=Path, metavar='DIR',
+        help=f"Only render covers the templates in DIR reference (default DIR: {DEFAULT_TEMPLATE_DIR})",
+    )
+    parser.add_argument(
+        '--plan', action='store_true',
+        help="Print what would be rendered, diffed against the templates and existing outputs, then exit",
+    )
+    parser.add_argument(
+        '--profile', nargs='?', const=Path('deck-images-profile.json'), type=Path, metavar='PATH',
+        help="Time each render stage, print a summary and write a JSON report "
+             "(default PATH: deck-images-profile.json; not --output-profile)",
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Generate all deck images."""
+    args = parse_args(argv)
+    if args.profile:
+        PROFILER.enable()
+    started = time.perf_counter()
+
     output_dir = Path('generated_deck_images')
-    output_dir.mkdir(exist_ok=True)
 
-    print("🎨 Creating custom deck images with purple gradient and glow effects...\n")
+    template_plan = None
+    decks = ICON_MAPPINGS.items()
+    if args.plan and args.from_templates is None:
+        args.from_templates = DEFAULT_TEMPLATE_DIR
+    if args.from_templates is not None:
+        template_plan = TemplatePlan(args.from_templates)
+        decks = [(deck_name, ICON_MAPPINGS[deck_name]) for deck_name in template_plan.needed]
+
+    # Resolve icons up front so workers only render
+    plan = []  # (deck_name, icon_path, output_path or None if the icon is missing)
+    with PROFILER.stage('find-icons'):
+        for deck_name, icon_path in decks:
+            found_icon = resolve_icon(icon_path)
+            if found_icon is None:
+                plan.append((deck_name, icon_path, None))
+                continue
+
+            # Create output filename
+            plan.append((deck_name, found_icon, output_dir / cover_file_name(deck_name)))
 
     created = 0
     missing = []
-    attributions = {}  # Track which authors contributed which icons
-
-    for deck_name, icon_path in ICON_MAPPINGS.items():
-        # Check if icon exists
-        if not Path(icon_path).exists():
-            # Try to find it
-            icon_name = Path(icon_path).stem
-            found_icon = find_icon(icon_name)
-            if found_icon:
-                icon_path = found_icon
-            else:
-                missing.append((deck_name, icon_path))
+
+    # Loaded even with --force, so entries for decks outside this build survive
+    manifest = BuildManifest(BUILD_MANIFEST_FILE)
+
+    # Decks with the same key produce identical images: render each key once
+    # and skip outputs that haven't changed since the last build
+    keys = {}        # output_path -> render key
+    sources = {}     # render key -> an up-to-date output with that key
+    stale = {}       # render key -> [(icon_path, output_path)] to (re)create
+    current = set()  # outputs unchanged since the last build
+    with PROFILER.stage('render-keys'):
+        for _, icon_path, output_path in plan:
+            if output_path is None:
                 continue
+            key = keys[output_path] = render_key(icon_path, profile=args.output_profile)
+            variants = [path for _, path, _, _ in variant_paths(output_path, args.output_profile)]
+            if not args.force and manifest.is_current(output_path, key) and all(path.exists() for path in variants):
+                current.add(output_path)
+                sources.setdefault(key, output_path)
+            else:
+                stale.setdefault(key, []).append((icon_path, output_path))
 
-        # Create output filename
-        safe_name = deck_name.lower().replace(' ', '-').replace('/', '-')
-        output_path = output_dir / f"{safe_name}.png"
+    to_render = [key for key in stale if key not in sources]
+    if args.plan:
+        print_plan(args.from_templates, template_plan, plan, current, manifest)
+        return 0
 
-        try:
-            author = create_deck_image(icon_path, output_path)
-            created += 1
+    output_dir.mkdir(exist_ok=True)
+    print("🎨 Creating custom deck images with purple gradient and glow effects...\n")
+
+    tasks = [(stale[key][0][0], stale[key][0][1], args.output_profile, bool(args.profile))
+             for key in to_render]
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    profiled = Profiler(memory=True) if args.profile else None
+    if profiled:
+        # Collect before forking, or every worker would report these again
+        profiled.merge(PROFILER.drain())
+    with ExitStack() as stack:
+        if jobs <= 1 or len(tasks) <= 1:
+            rendered = map(render_deck, tasks)
+        else:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+            rendered = executor.map(render_deck, tasks)
+
+        errors = {}
+        for key, (_, error, stats) in zip(to_render, rendered):
+            if profiled:
+                profiled.merge(stats)
+            if error:
+                errors[key] = error
+            else:
+                sources[key] = stale[key][0][1]
 
-            # Track attribution
-            icon_name = Path(icon_path).stem
-            if author not in attributions:
-                attributions[author] = []
-            attributions[author].append(f"{deck_name} ({icon_name})")
+    rendered_count = len(to_render) - len(errors)
+    reused = unchanged = 0
 
-        except Exception as e:
-            print(f"✗ Error creating {deck_name}: {e}")
+    # Report in mapping order, so output matches between serial and parallel runs
+    for deck_name, icon_path, output_path in plan:
+        if output_path is None:
             missing.append((deck_name, icon_path))
+            continue
 
-    # Create attribution file
+        key = keys[output_path]
+        if key in errors:
+            print(f"✗ Error creating {deck_name}: {errors[key]}")
+            missing.append((deck_name, icon_path))
+            continue
+
+        source = sources[key]
+        if output_path in current:
+            print(f"· Unchanged {output_path}")
+            unchanged += 1
+        elif source != output_path:
+            variants = zip(variant_paths(source, args.output_profile), variant_paths(output_path, args.output_profile))
+            for (_, source_variant, _, _), (_, output_variant, _, _) in variants:
+                shutil.copyfile(source_variant, output_variant)
+            print(f"✓ Created {output_path} (same image as {source.name})")
+            reused += 1
+        else:
+            print(f"✓ Created {output_path}")
+        manifest.record(output_path, key, icon_path)
+        created += 1
+
+    manifest.save()
+
+    if args.output_profile != 'png':
+        covers = write_covers_manifest(output_dir, [p for _, _, p in plan if p is not None and keys[p] not in errors], args.output_profile)
+        totals = {}
+        for variants in covers.values():
+            for name, variant in variants.items():
+                totals[name] = totals.get(name, 0) + variant['bytes']
+        sizes = ', '.join(f"{name} {size / 1024:.0f} KiB" for name, size in sorted(totals.items()))
+        print(f"📦 Wrote {output_dir}/{COVERS_MANIFEST_NAME}: {sizes}")
+
+    # Pack covers into atlases, so a client needs one request per template
+    built = {cover_slug(p.name): p for _, _, p in plan if p is not None and keys[p] not in errors}
+    atlases = []
+    if args.atlas:
+        atlases.append((output_dir / 'atlas.png', [p.name for p in built.values()]))
+    for template_path in args.atlas_template:
+        atlases.append((output_dir / f"atlas-{template_path.stem}.png", template_cover_names(template_path)))
+    for atlas_path, names in atlases:
+        covers = [(name, built[cover_slug(name)]) for name in names if cover_slug(name) in built]
+        with PROFILER.stage('atlas'):
+            build_atlas(covers, atlas_path)
+        print(f"🧩 Created {atlas_path} with {len(covers)} covers")
+        others = [name for name in names if cover_slug(name) not in built]
+        if others:
+            print(f"   Not generated here, left out: {', '.join(others)}")
+
+    # Create attribution file, crediting every image on disk, not just this build's
+    attributions = collect_attributions(manifest, output_dir)
     with open(output_dir / 'ATTRIBUTIONS.txt', 'w') as f:
         f.write("Deck Image Attributions\n")
         f.write("=" * 50 + "\n\n")
@@ -244,6 +844,7 @@ def main():
 
     print(f"\n✅ Successfully created {created} deck images in '{output_dir}/'")
     print(f"✅ Created attribution file: {output_dir}/ATTRIBUTIONS.txt")
+    print(f"♻️  Rendered {rendered_count} distinct images, reused {reused}, {unchanged} unchanged since last build")
 
     if missing:
         print(f"\n⚠️  Could not find icons for:")
@@ -256,6 +857,14 @@ def main():
     print("   3. Upload images to your CDN/storage")
     print("   4. Update templates with new image URLs")
 
+    if profiled:
+        # Serial renders ran in this process, so their stages are in PROFILER too
+        wall = time.perf_counter() - started
+        profiled.merge(PROFILER.drain())
+        profiled.print_summary(f"Profile of {len(tasks)} renders with {jobs} jobs", wall)
+        profiled.write_report(args.profile, wall, renders=len(tasks), jobs=jobs, output_profile=args.output_profile)
+        print(f"✅ Profile written to {args.profile}")
+
     return 0 if not missing else 1
 
 if __name__ == '__main__':
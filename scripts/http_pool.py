@@ -0,0 +1,119 @@
+"""
+Keep-alive HTTP connections for the scripts that talk to servers.
+
+Each thread keeps one connection per host and reuses it between requests,
+so a ThreadPoolExecutor with N workers opens at most N connections per
+host. Only the standard library is used.
+"""
+
+import http.client
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# Statuses worth another attempt; anything else is returned as is
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class Response(NamedTuple):
+    status: int
+    headers: Dict[str, str]  # lower-cased names
+    body: bytes
+
+class ConnectionPool:
+    """
+    Per-thread keep-alive connections with retries.
+
+    Connection errors, malformed responses and RETRY_STATUSES are retried
+    up to `retries` times with exponential backoff (or the server's
+    Retry-After, if longer). If the last attempt fails, the error is raised
+    as an OSError, so callers only have one exception type to handle.
+    """
+
+    def __init__(self, timeout: float = 10.0, retries: int = 3, backoff: float = 0.5,
+                 headers: Optional[Dict[str, str]] = None):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.headers = dict(headers or {})
+        self.requests = 0
+        self.connections_opened = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open = []
+
+    def _connections(self) -> Dict:
+        if not hasattr(self._local, 'connections'):
+            self._local.connections = {}
+        return self._local.connections
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        connections = self._connections()
+        conn = connections.get((scheme, netloc))
+        if conn is None:
+            if scheme == 'https':
+                conn = http.client.HTTPSConnection(netloc, timeout=self.timeout)
+            else:
+                conn = http.client.HTTPConnection(netloc, timeout=self.timeout)
+            connections[(scheme, netloc)] = conn
+            with self._lock:
+                self.connections_opened += 1
+                self._open.append(conn)
+        return conn
+
+    def _discard(self, scheme: str, netloc: str):
+        conn = self._connections().pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+            with self._lock:
+                if conn in self._open:
+                    self._open.remove(conn)
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None) -> Response:
+        """Send a request, reusing this thread's connection to the host."""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL: {url}")
+        target = urlunsplit(('', '', parts.path or '/', parts.query, ''))
+        merged = dict(self.headers, **(headers or {}))
+
+        for attempt in range(self.retries + 1):
+            conn = self._connect(parts.scheme, parts.netloc)
+            with self._lock:
+                self.requests += 1
+            delay = self.backoff * 2 ** attempt
+            try:
+                conn.request(method, target, body=body, headers=merged)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (OSError, http.client.HTTPException) as e:
+                # Stale keep-alive connections end up here too; reconnect
+                self._discard(parts.scheme, parts.netloc)
+                if attempt == self.retries:
+                    if isinstance(e, http.client.HTTPException):
+                        raise OSError(f"Bad response from {parts.netloc}: {e!r}") from e
+                    raise
+            else:
+                if resp.will_close:
+                    self._discard(parts.scheme, parts.netloc)
+                response = Response(resp.status, {k.lower(): v for k, v in resp.getheaders()}, data)
+                if response.status not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                retry_after = response.headers.get('retry-after', '')
+                if retry_after.isdigit():
+                    delay = max(delay, min(int(retry_after), 30))
+            time.sleep(delay)
+
+    def close(self):
+        """Close every connection opened by any thread."""
+        with self._lock:
+            for conn in self._open:
+                conn.close()
+            self._open.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Finds near-duplicate cards and decks across templates.
+
+Each card's content is split into word shingles, which are condensed into a
+MinHash signature. Locality-sensitive hashing (LSH) on signature bands
+finds candidate pairs without comparing every card to every other. Only
+candidates get an exact Jaccard check, so the cost grows roughly linearly
+with the number of cards.
+
+Usage:
+    python3 scripts/near_duplicates.py
+    python3 scripts/near_duplicates.py --threshold 0.6
+
+validate-templates.py runs the same pass with --near-duplicates.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Tuple
+
+# Shingles are hashed to 31 bits, so (a * h + b) fits in 64 bits
+MERSENNE_PRIME = (1 << 31) - 1
+
+SHINGLE_WORDS = 3
+# Cards shorter than this (in words) are too generic to be worth reporting
+MIN_WORDS = 8
+
+DEFAULT_THRESHOLD = 0.8
+
+# Signature length; the bands and rows chosen for a threshold use at most this many values
+NUM_PERM = 128
+# Chance that a pair right at the threshold becomes a candidate
+MIN_RECALL = 0.999
+
+def shingles(text: str, k: int = SHINGLE_WORDS) -> FrozenSet[int]:
+    """Hashed k-word shingles of lower-cased text, ignoring punctuation and markdown."""
+    words = re.findall(r'[a-z0-9]+', text.lower())
+    if len(words) < k:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = [' '.join(words[i:i + k]) for i in range(len(words) - k + 1)]
+    return frozenset(
+        int.from_bytes(hashlib.blake2b(g.encode(), digest_size=4).digest(), 'little') % MERSENNE_PRIME
+        for g in grams
+    )
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    """Share of shingles two texts have in common."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+def candidate_probability(similarity: float, bands: int, rows: int) -> float:
+    """Chance that two items with this Jaccard similarity share at least one band."""
+    return 1 - (1 - similarity ** rows) ** bands
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """
+    (bands, rows) for a similarity threshold.
+
+    Of the layouts that make a pair at `threshold` a candidate with at least
+    MIN_RECALL probability, picks the one with the fewest expected
+    candidates below the threshold, i.e. the least exact comparisons wasted.
+    Very low thresholds can't reach MIN_RECALL with num_perm hashes; they
+    get one-row bands, the layout with the highest recall.
+    """
+    steps = 100
+    best = None
+    for rows in range(1, num_perm + 1):
+        for bands in range(1, num_perm // rows + 1):
+            if candidate_probability(threshold, bands, rows) < MIN_RECALL:
+                continue
+            wasted = sum(candidate_probability(threshold * (i + 0.5) / steps, bands, rows) for i in range(steps))
+            if best is None or wasted < best[0]:
+                best = (wasted, bands, rows)
+            break  # more bands only add candidates
+    if best is None:
+        return num_perm, 1
+    return best[1], best[2]
+
+class MinHashIndex:
+    """
+    MinHash signatures banded into LSH buckets.
+
+    The number of bands and rows follows from `threshold` (see lsh_params),
+    so pairs at or above it are found with high probability.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, seed: int = 1):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        bands, rows = lsh_params(threshold)
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        self.perms = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(bands * rows)
+        ]
+        self.keys = []
+        self.shingles = []
+        self.buckets = {}  # (band, band values) -> item numbers
+
+    def signature(self, items: FrozenSet[int]) -> List[int]:
+        return [min((a * h + b) % MERSENNE_PRIME for h in items) for a, b in self.perms]
+
+    def add(self, key: str, text: str) -> bool:
+        """Index one text. Returns False if it was too short to index."""
+        if len(re.findall(r'[a-z0-9]+', text.lower())) < MIN_WORDS:
+            return False
+        items = shingles(text)
+        number = len(self.keys)
+        self.keys.append(key)
+        self.shingles.append(items)
+
+        sig = self.signature(items)
+        for band in range(self.bands):
+            values = tuple(sig[band * self.rows:(band + 1) * self.rows])
+            self.buckets.setdefault((band, values), []).append(number)
+        return True
+
+    def pairs(self) -> List[Tuple[str, str, float]]:
+        """Candidate pairs from shared buckets that reach the threshold exactly."""
+        candidates = set()
+        for members in self.buckets.values():
+            for i, first in enumerate(members):
+                for second in members[i + 1:]:
+                    candidates.add((first, second))
+
+        found = []
+        for first, second in sorted(candidates):
+            similarity = jaccard(self.shingles[first], self.shingles[second])
+            if similarity >= self.threshold:
+                found.append((self.keys[first], self.keys[second], similarity))
+        return found
+
+def group_pairs(pairs: List[Tuple[str, str, float]]) -> List[Dict]:
+    """
+    Merge pairs into connected components of similar pairs (union-find).
+
+    A group is linked by a chain of similar pairs: if A~B and B~C, A and C
+    share a group even when they are below the threshold themselves. Its
+    'similarity' is the lowest of the pairs that link it.
+    """
+    parent = {}
+
+    def root(key):
+        while parent.setdefault(key, key) != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for first, second, _ in pairs:
+        parent[root(first)] = root(second)
+
+    groups = {}
+    for first, second, similarity in pairs:
+        group = groups.setdefault(root(first), {'members': set(), 'similarity': 1.0})
+        group['members'].update((first, second))
+        group['similarity'] = min(group['similarity'], similarity)
+
+    return sorted(
+        ({'members': sorted(g['members']), 'similarity': round(g['similarity'], 3)} for g in groups.values()),
+        key=lambda g: (-len(g['members']), g['members']),
+    )
+
+def iter_decks(paths: List[Path]) -> Iterator[Tuple[str, str, List[str]]]:
+    """(template file, deck name, card contents) for every deck."""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            template = json.load(f)
+        for space in template.get('spaces', []):
+            for deck in space.get('decks', []):
+                yield path.name, deck.get('name', ''), [card.get('content', '') for card in deck.get('cards', [])]
+
+def find_near_duplicates(paths: List[Path], threshold: float = DEFAULT_THRESHOLD) -> Dict[str, List[Dict]]:
+    """
+    Near-duplicate groups of cards and of whole decks across templates.
+
+    Members are named like 'rpg.json › Design Notes › card 2'.
+    """
+    cards = MinHashIndex(threshold)
+    decks = MinHashIndex(threshold)
+    for template, deck_name, contents in iter_decks(paths):
+        for idx, content in enumerate(contents):
+            cards.add(f"{template} › {deck_name} › card {idx + 1}", content)
+        decks.add(f"{template} › {deck_name}", '\n'.join(contents))
+
+    return {
+        'cards': group_pairs(cards.pairs()),
+        'decks': group_pairs(decks.pairs()),
+    }
+
+def format_groups(kind: str, groups: List[Dict]) -> List[str]:
+    """Text lines for one kind of group."""
+    if not groups:
+        return []
+    lines = [f"\n🔁 {len(groups)} groups of near-duplicate {kind} (linked by similar pairs; not every two members are similar):"]
+    for group in groups:
+        lines.append(f"  {len(group['members'])} {kind}, linked by pairs with similarity ≥ {group['similarity']:.2f}:")
+        lines.extend(f"    - {member}" for member in group['members'])
+    return lines
+
+def parse_threshold(value: str) -> float:
+    """Parse a similarity threshold for argparse."""
+    try:
+        threshold = float(value)
+    except ValueError:
+        threshold = None
+    if threshold is None or not 0 < threshold <= 1:
+        raise argparse.ArgumentTypeError(f"expected a similarity between 0 and 1, got '{value}'")
+    return threshold
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Find near-duplicate cards and decks across templates.")
+    parser.add_argument(
+        '--threshold', type=parse_threshold, default=DEFAULT_THRESHOLD,
+        help=f"Minimum Jaccard similarity of word shingles (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument('--json', action='store_true', help="Print the groups as JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Report near-duplicates in templates/cdx."""
+    args = parse_args(argv)
+    templates_dir = Path('templates/cdx')
+
+    if not templates_dir.exists():
+        print(f"Error: {templates_dir} not found")
+        return 1
+
+    groups = find_near_duplicates(sorted(templates_dir.glob('*.json')), args.threshold)
+    if args.json:
+        print(json.dumps(groups, indent=2, ensure_ascii=False))
+        return 0
+
+    lines = format_groups('cards', groups['cards']) + format_groups('decks', groups['decks'])
+    print('\n'.join(lines) if lines else "✅ No near-duplicate cards or decks")
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,137 @@
+"""
+Opt-in wall time, call count and memory profiling for the template scripts.
+
+`PROFILER.stage(name)` measures a block. `PROFILER.lap(name)` charges the
+time since the previous lap (or since the enclosing stage started) to
+`name`, so a long function can be split into measured sections without
+restructuring it. Memory is the tracemalloc peak above what was allocated
+when the section started.
+
+The profiler is off unless enabled. While off, stage() returns a shared
+no-op context and lap() returns at once, so the calls can stay in hot paths.
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO
+
+_NULL_STAGE = nullcontext()
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'start', 'base', 'peak')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        profiler._fold_peak()
+        self.base = profiler._current()
+        self.peak = self.base
+        profiler._stack.append(self)
+        self.start = time.perf_counter()
+        profiler._mark = (self.start, self.base)
+        return self
+
+    def __exit__(self, *exc):
+        profiler = self.profiler
+        end = time.perf_counter()
+        profiler._fold_peak()
+        profiler._stack.pop()
+        profiler.record(self.name, end - self.start, self.peak - self.base)
+        profiler._mark = (time.perf_counter(), profiler._current())
+
+class Profiler:
+    """Collects {name: seconds, calls, peak_bytes} for stages and laps."""
+
+    def __init__(self, memory: bool = False):
+        self.enabled = False
+        self.memory = memory
+        self.stats = {}
+        self._stack = []
+        self._mark = (0.0, 0)
+
+    def enable(self, memory: bool = True):
+        """Start recording; with `memory`, also trace allocations (slower)."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._mark = (time.perf_counter(), self._current())
+
+    def _current(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if self.memory else 0
+
+    def _fold_peak(self) -> int:
+        """Peak since the last reset, also credited to every open stage."""
+        if not self.memory:
+            return 0
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        for stage in self._stack:
+            stage.peak = max(stage.peak, peak)
+        return peak
+
+    def stage(self, name: str):
+        """Context manager measuring a block as `name`."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def lap(self, name: str):
+        """Charge the time since the last lap or stage start to `name`."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        start, base = self._mark
+        peak = self._fold_peak()
+        self.record(name, now - start, max(0, peak - base) if self.memory else 0)
+        self._mark = (time.perf_counter(), self._current())
+
+    def record(self, name: str, seconds: float, peak_bytes: int = 0, calls: int = 1):
+        entry = self.stats.setdefault(name, {'seconds': 0.0, 'calls': 0, 'peak_bytes': 0})
+        entry['seconds'] += seconds
+        entry['calls'] += calls
+        entry['peak_bytes'] = max(entry['peak_bytes'], peak_bytes)
+
+    def merge(self, stats: Optional[Dict[str, Dict]]):
+        """Add stats collected elsewhere, e.g. returned by a worker process."""
+        for name, entry in (stats or {}).items():
+            self.record(name, entry['seconds'], entry['peak_bytes'], entry['calls'])
+
+    def drain(self) -> Dict[str, Dict]:
+        """Return the stats so far and start over."""
+        stats, self.stats = self.stats, {}
+        return stats
+
+    def rows(self) -> List[Dict]:
+        """Stats sorted by total time, slowest first."""
+        return sorted(
+            ({'name': name, **entry} for name, entry in self.stats.items()),
+            key=lambda row: -row['seconds'],
+        )
+
+    def print_summary(self, title: str, wall_seconds: float, file: TextIO = sys.stdout):
+        print(f"\n⏱️  {title} (wall time {wall_seconds * 1000:.1f} ms)", file=file)
+        print(f"  {'section':<28} {'calls':>7} {'total ms':>10} {'mean µs':>10} {'peak KiB':>9}", file=file)
+        for row in self.rows():
+            mean = row['seconds'] / row['calls'] * 1e6 if row['calls'] else 0
+            peak = f"{row['peak_bytes'] / 1024:.1f}" if self.memory else '-'
+            print(f"  {row['name']:<28} {row['calls']:>7} {row['seconds'] * 1000:>10.2f} {mean:>10.1f} {peak:>9}", file=file)
+
+    def write_report(self, path: Path, wall_seconds: float, **extra):
+        report = {'wall_seconds': round(wall_seconds, 6), 'memory': self.memory, **extra, 'sections': [
+            dict(row, seconds=round(row['seconds'], 6)) for row in self.rows()
+        ]}
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+# Shared by everything in one process
+PROFILER = Profiler()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Validate templates against the remote /templates/validate endpoint.
+
+Sends one payload per file, concurrently, over pooled keep-alive
+connections. Writes the same result lines the validate-templates workflow
+used to build in bash, plus all_valid to $GITHUB_OUTPUT when it is set.
+
+Usage:
+    API_HOST=https://api.example.com API_TOKEN=... \\
+        python3 scripts/remote_validate.py templates/cdx/rpg.json templates/cdx/saas.json
+    python3 scripts/remote_validate.py --endpoint http://localhost:8000/templates/validate templates/cdx/*.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from http_pool import ConnectionPool
+
+DEFAULT_RESULTS_FILE = Path('/tmp/validation_results.txt')
+
+class RemoteResult(NamedTuple):
+    file: str
+    status: Optional[int]  # None if the request never got a response
+    valid: bool
+    errors: List[str]
+    message: str  # service error detail, if any
+
+def build_payload(file: str) -> bytes:
+    """{org, template, content} for templates/<org>/<template>.json."""
+    parts = Path(file).parts
+    org = parts[1] if len(parts) > 1 else ''
+    with open(file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return json.dumps({'org': org, 'template': Path(file).stem, 'content': content}).encode('utf-8')
+
+def validate_remote(pool: ConnectionPool, endpoint: str, file: str) -> RemoteResult:
+    """POST one template and interpret the response."""
+    try:
+        response = pool.request('POST', endpoint, body=build_payload(file), headers={'Content-Type': 'application/json'})
+    except (OSError, ValueError, http.client.HTTPException) as e:
+        # Every file must still get a result line for the Check Run
+        return RemoteResult(file, None, False, [], str(e))
+
+    body = response.body.decode('utf-8', errors='replace').strip()
+    try:
+        data = json.loads(body) if body else {}
+    except ValueError:
+        data = None
+
+    if response.status == 200 and isinstance(data, dict):
+        return RemoteResult(file, 200, data.get('valid') is True, [str(e) for e in data.get('errors') or []], '')
+
+    message = body
+    if isinstance(data, dict):
+        message = str(data.get('message') or data.get('error') or '')
+    return RemoteResult(file, response.status, False, [], message)
+
+def format_result(result: RemoteResult, repo: str, sha: str) -> str:
+    """One markdown line for the Check Run, as the workflow's bash loop wrote it."""
+    link = f"[`{result.file}`](https://github.com/{repo}/blob/{sha}/{result.file})"
+    if result.status == 200 and result.valid:
+        return f"✅ {link} - Valid"
+    if result.status == 200:
+        errors = '\n'.join(f"- {error}  " for error in result.errors)
+        return f"❌ {link} - Invalid <details><summary>Errors</summary>{errors}</details>"
+    detail = f" - {result.message}" if result.message else ''
+    return f"⚠️ {link} - Validation service error (HTTP {result.status or '000'}){detail}"
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Validate templates with the remote validation endpoint.")
+    parser.add_argument('files', nargs='*', help="Template files, e.g. templates/cdx/rpg.json")
+    parser.add_argument('--endpoint', help="Validation URL (default: $API_HOST/templates/validate)")
+    parser.add_argument('--token-env', default='API_TOKEN', help="Environment variable with the bearer token (default: API_TOKEN)")
+    parser.add_argument('-j', '--jobs', type=int, default=8, help="Requests in flight at once (default: 8)")
+    parser.add_argument('--retries', type=int, default=3, help="Retries on errors and 5xx (default: 3)")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Seconds per request (default: 30)")
+    parser.add_argument(
+        '--results-file', type=Path, default=DEFAULT_RESULTS_FILE,
+        help=f"Where to write the Check Run lines (default: {DEFAULT_RESULTS_FILE})",
+    )
+    parser.add_argument('--repo', default=os.environ.get('REPO', ''), help="owner/name for file links (default: $REPO)")
+    parser.add_argument('--sha', default=os.environ.get('SHA', ''), help="Commit for file links (default: $SHA)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Validate the given files remotely.
+
+    Exits 0 once results are written, even if templates are invalid;
+    all_valid in $GITHUB_OUTPUT carries the verdict, as in the workflow.
+    """
+    args = parse_args(argv)
+    endpoint = args.endpoint
+    if not endpoint:
+        if not os.environ.get('API_HOST'):
+            print("Error: pass --endpoint or set API_HOST")
+            return 1
+        endpoint = f"{os.environ['API_HOST']}/templates/validate"
+
+    headers = {}
+    token = os.environ.get(args.token_env)
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+
+    print(f"Validating {len(args.files)} files with up to {args.jobs} requests in flight")
+    with ConnectionPool(timeout=args.timeout, retries=args.retries, headers=headers) as pool:
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            results = list(executor.map(lambda f: validate_remote(pool, endpoint, f), args.files))
+        requests, opened = pool.requests, pool.connections_opened
+
+    all_valid = True
+    lines = []
+    for result in results:
+        if result.status == 200 and result.valid:
+            print(f"✅ {result.file} is valid")
+        elif result.status == 200:
+            print(f"❌ {result.file} is invalid")
+            all_valid = False
+        else:
+            print(f"⚠️ Failed to validate {result.file} (HTTP {result.status or '000'})")
+            all_valid = False
+        lines.append(format_result(result, args.repo, args.sha))
+    print(f"   {requests} requests over {opened} connections")
+
+    with open(args.results_file, 'w', encoding='utf-8') as f:
+        f.write(''.join(f"{line}\n" for line in lines))
+
+    github_output = os.environ.get('GITHUB_OUTPUT')
+    if github_output:
+        with open(github_output, 'a') as f:
+            f.write(f"all_valid={'true' if all_valid else 'false'}\n")
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
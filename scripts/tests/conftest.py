@@ -0,0 +1,77 @@
+"""
+Shared fixtures for the script tests.
+
+The scripts live flat in scripts/ and import each other by module name, so
+that directory goes on sys.path here.
+"""
+
+import importlib.util
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+@pytest.fixture(scope='session')
+def validator():
+    """validate-templates.py as a module (its name has a dash, so it can't be imported directly)."""
+    spec = importlib.util.spec_from_file_location('validate_templates', SCRIPTS_DIR / 'validate-templates.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers from the server's `routes`; unknown paths get a 404."""
+    protocol_version = 'HTTP/1.1'
+
+    def handle_any(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        self.server.requests.append((self.command, self.path, dict(self.headers), body))
+
+        route = self.server.routes.get(self.path, (404, {}, b'not found'))
+        if callable(route):
+            route = route(self.command, self.headers, body)
+        if isinstance(route, bytes):
+            # Raw bytes are sent as is, e.g. to simulate a broken server
+            self.wfile.write(route)
+            self.close_connection = True
+            return
+
+        status, headers, data = route
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+    do_GET = do_HEAD = do_POST = handle_any
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub_server():
+    """
+    Start a local HTTP server; its base URL is `server.url`.
+
+    Set `server.routes[path]` to (status, headers, body), to raw bytes, or
+    to a callable(method, headers, body) returning either. Requests are
+    recorded in `server.requests`.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.routes = {}
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,77 @@
+"""build_template_bundle.py end to end, with a local stub of /templates/sync."""
+
+import json
+import socket
+
+from build_template_bundle import build_index, compile_templates, index_digest, main
+
+def write_templates(root, templates):
+    """templates/<org>/<name>.json for each 'org/name' id."""
+    for tid, data in templates.items():
+        path = root / f'{tid}.json'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data))
+
+def build(tmp_path, *extra):
+    """Run the tool on tmp_path/templates into tmp_path/dist and return its exit status."""
+    return main(['--templates', str(tmp_path / 'templates'), '-o', str(tmp_path / 'dist'), *extra])
+
+def test_delta_against_previous_index(tmp_path):
+    templates = tmp_path / 'templates'
+    write_templates(templates, {
+        'cdx/rpg': {'meta': {'id': 'rpg'}},
+        'cdx/scrum': {'meta': {'id': 'scrum'}},
+        'cdx/old': {'meta': {'id': 'old'}},
+    })
+    assert build(tmp_path) == 0
+    previous_index = tmp_path / 'previous-index.json'
+    (tmp_path / 'dist' / 'index.json').rename(previous_index)
+    previous = json.loads(previous_index.read_text())
+
+    (templates / 'cdx' / 'old.json').unlink()
+    write_templates(templates, {'cdx/rpg': {'meta': {'id': 'rpg', 'title': 'RPG'}}})
+    assert build(tmp_path, '--previous-index', str(previous_index)) == 0
+
+    delta = json.loads((tmp_path / 'dist' / 'delta.json').read_text())
+    assert delta['templates'] == {'cdx/rpg': {'meta': {'id': 'rpg', 'title': 'RPG'}}}
+    assert delta['removed'] == ['cdx/old']
+    assert delta['base'] == index_digest(previous)
+    assert delta['target'] == index_digest(build_index(compile_templates(templates)))
+    assert json.loads((tmp_path / 'dist' / 'index.json').read_text()) == build_index(compile_templates(templates))
+
+def test_without_previous_index_delta_has_everything(tmp_path):
+    write_templates(tmp_path / 'templates', {'cdx/rpg': {'meta': {'id': 'rpg'}}})
+    assert build(tmp_path) == 0
+    delta = json.loads((tmp_path / 'dist' / 'delta.json').read_text())
+    assert delta['base'] is None
+    assert list(delta['templates']) == ['cdx/rpg'] and delta['removed'] == []
+
+def test_posts_delta_with_token(stub_server, tmp_path, monkeypatch):
+    write_templates(tmp_path / 'templates', {'cdx/rpg': {'meta': {'id': 'rpg'}}})
+    stub_server.routes['/templates/sync'] = (202, {}, b'{"queued": true}')
+    monkeypatch.setenv('API_TOKEN', 'secret')
+
+    assert build(tmp_path, '--endpoint', f"{stub_server.url}/templates/sync") == 0
+
+    (method, path, headers, body), = stub_server.requests
+    assert (method, path) == ('POST', '/templates/sync')
+    assert headers['Authorization'] == 'Bearer secret'
+    assert body.decode('utf-8') == (tmp_path / 'dist' / 'delta.json').read_text()
+
+def test_error_status_fails(stub_server, tmp_path, monkeypatch):
+    write_templates(tmp_path / 'templates', {'cdx/rpg': {'meta': {'id': 'rpg'}}})
+    stub_server.routes['/templates/sync'] = (409, {}, b'{"message": "base mismatch"}')
+    monkeypatch.delenv('API_TOKEN', raising=False)
+
+    assert build(tmp_path, '--endpoint', f"{stub_server.url}/templates/sync") == 1
+    assert 'Authorization' not in stub_server.requests[0][2]
+
+def test_unreachable_server_fails(tmp_path, capsys):
+    write_templates(tmp_path / 'templates', {'cdx/rpg': {'meta': {'id': 'rpg'}}})
+    # A port that was just free, so nothing is listening on it
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+
+    assert build(tmp_path, '--endpoint', f"http://127.0.0.1:{port}/templates/sync", '--retries', '0') == 1
+    assert '❌ Sync failed:' in capsys.readouterr().out
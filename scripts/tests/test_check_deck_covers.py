@@ -0,0 +1,89 @@
+"""check_deck_covers.py and http_pool.py against a local stub server."""
+
+import pytest
+
+from check_deck_covers import CheckCache, UrlCheck, check_url, check_urls, cover_slug, rebase_url
+from http_pool import ConnectionPool
+
+PNG = (200, {'Content-Type': 'image/png'}, b'\x89PNG')
+GARBAGE = b'this is not http\r\n\r\n'
+
+def test_image_is_ok(stub_server):
+    stub_server.routes['/covers/weapons.png'] = PNG
+    with ConnectionPool(retries=0) as pool:
+        assert check_url(pool, f"{stub_server.url}/covers/weapons.png") == UrlCheck(True, 200, 'image/png', '')
+
+def test_missing_and_non_image_fail(stub_server):
+    stub_server.routes['/page.html'] = (200, {'Content-Type': 'text/html'}, b'<html>')
+    with ConnectionPool(retries=0) as pool:
+        missing = check_url(pool, f"{stub_server.url}/covers/missing.png")
+        html = check_url(pool, f"{stub_server.url}/page.html")
+    assert (missing.ok, missing.status, missing.error) == (False, 404, 'HTTP 404')
+    assert not html.ok and html.error.startswith('not an image')
+
+def test_falls_back_to_ranged_get_without_head(stub_server):
+    def no_head(method, headers, body):
+        if method == 'HEAD':
+            return (405, {}, b'')
+        assert headers['Range'] == 'bytes=0-0'
+        return (206, {'Content-Type': 'image/png'}, b'\x89')
+
+    stub_server.routes['/covers/items.png'] = no_head
+    with ConnectionPool(retries=0) as pool:
+        assert check_url(pool, f"{stub_server.url}/covers/items.png").ok
+    assert [method for method, *_ in stub_server.requests] == ['HEAD', 'GET']
+
+def test_malformed_response_is_a_failed_check(stub_server):
+    stub_server.routes['/covers/broken.png'] = GARBAGE
+    with ConnectionPool(retries=1, backoff=0) as pool:
+        check = check_url(pool, f"{stub_server.url}/covers/broken.png")
+    assert not check.ok and check.status is None
+    assert 'Bad response' in check.error
+    assert len(stub_server.requests) == 2
+
+def test_one_broken_url_does_not_stop_the_rest(stub_server, tmp_path):
+    stub_server.routes['/a.png'] = PNG
+    stub_server.routes['/b.png'] = GARBAGE
+    urls = [f"{stub_server.url}/a.png", f"{stub_server.url}/b.png", f"{stub_server.url}/c.png"]
+    cache = CheckCache(tmp_path / 'cache.json', ttl_hours=1)
+
+    results, _ = check_urls(urls, jobs=4, timeout=5, retries=0, cache=cache)
+
+    assert [results[url].ok for url in urls] == [True, False, False]
+    # Only good results are cached
+    assert set(cache.entries) == {urls[0]}
+
+def test_pool_retries_server_errors(stub_server):
+    statuses = iter([503, 503, 200])
+    stub_server.routes['/flaky'] = lambda *_: (next(statuses), {}, b'ok')
+    with ConnectionPool(retries=2, backoff=0) as pool:
+        assert pool.request('GET', f"{stub_server.url}/flaky").status == 200
+        # Keep-alive: every attempt went over the one connection
+        assert pool.connections_opened == 1
+
+def test_pool_raises_protocol_errors_as_oserror(stub_server):
+    stub_server.routes['/broken'] = GARBAGE
+    with ConnectionPool(retries=0) as pool:
+        with pytest.raises(OSError):
+            pool.request('GET', f"{stub_server.url}/broken")
+
+def test_pool_forgets_discarded_connections(stub_server):
+    stub_server.routes['/broken'] = GARBAGE
+    stub_server.routes['/a.png'] = PNG
+    with ConnectionPool(retries=3, backoff=0) as pool:
+        with pytest.raises(OSError):
+            pool.request('GET', f"{stub_server.url}/broken")
+        assert pool.connections_opened == 4
+        assert pool._open == []
+        pool.request('GET', f"{stub_server.url}/a.png")
+        assert len(pool._open) == 1
+
+def test_cover_slug_is_shared():
+    pytest.importorskip('PIL')
+    import create_deck_images
+    assert create_deck_images.cover_slug is cover_slug
+    assert cover_slug('items-&-power-ups.png') == cover_slug('https://cdn.example.com/covers/items-power-ups.png')
+
+def test_rebase_url_keeps_path():
+    assert rebase_url('https://cdn.example.com/covers/a.png', 'http://localhost:8000/') == 'http://localhost:8000/covers/a.png'
+    assert rebase_url('https://cdn.example.com/covers/a.png', None) == 'https://cdn.example.com/covers/a.png'
@@ -0,0 +1,41 @@
+"""create_deck_images.py attributions on a fresh clone, where no build manifest exists."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('PIL')
+
+import create_deck_images
+from create_deck_images import BuildManifest, collect_attributions
+
+REPO = Path(__file__).resolve().parents[2]
+
+def test_credits_covers_without_manifest_entries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_dir = tmp_path / 'generated_deck_images'
+    output_dir.mkdir()
+    (output_dir / 'crafting-recipes.png').write_bytes(b'')
+    manifest = BuildManifest(tmp_path / 'missing-manifest.json')
+
+    # Nothing to go on but ICON_MAPPINGS
+    assert collect_attributions(manifest, output_dir) == {'delapouite': ['Crafting Recipes (anvil)']}
+
+    # An existing credit line wins over the mapping, since it names the icon actually used
+    (output_dir / 'ATTRIBUTIONS.txt').write_text(
+        "Icons by delapouite:\n  - Crafting Recipes (anvil-impact)\n", encoding='utf-8')
+    assert collect_attributions(manifest, output_dir) == {'delapouite': ['Crafting Recipes (anvil-impact)']}
+
+@pytest.mark.skipif(not (REPO / 'generated_deck_images' / 'ATTRIBUTIONS.txt').exists(), reason="no generated covers")
+def test_from_templates_keeps_attributions_on_fresh_clone(tmp_path, monkeypatch):
+    shutil.copytree(REPO / 'generated_deck_images', tmp_path / 'generated_deck_images')
+    shutil.copytree(REPO / 'templates', tmp_path / 'templates')
+    monkeypatch.chdir(tmp_path)
+    assert not create_deck_images.BUILD_MANIFEST_FILE.exists()
+
+    create_deck_images.main(['--from-templates'])
+
+    attributions = (tmp_path / 'generated_deck_images' / 'ATTRIBUTIONS.txt').read_text(encoding='utf-8')
+    assert attributions == (REPO / 'generated_deck_images' / 'ATTRIBUTIONS.txt').read_text(encoding='utf-8')
+    assert '  - Crafting Recipes (anvil-impact)\n' in attributions
@@ -0,0 +1,60 @@
+"""near_duplicates.py: LSH parameters and recall against brute force."""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from near_duplicates import (
+    MIN_RECALL, MIN_WORDS, NUM_PERM, MinHashIndex, candidate_probability, format_groups, group_pairs, iter_decks, jaccard,
+    lsh_params, shingles,
+)
+
+TEMPLATES = sorted((Path(__file__).resolve().parents[2] / 'templates' / 'cdx').glob('*.json'))
+
+@pytest.mark.parametrize('threshold', [0.01, 0.05, 0.1, 0.3, 0.5, 0.8, 0.95, 1.0])
+def test_lsh_params_reach_recall(threshold):
+    bands, rows = lsh_params(threshold)
+    assert bands * rows <= NUM_PERM
+    if candidate_probability(threshold, NUM_PERM, 1) < MIN_RECALL:
+        # Out of reach: falls back to the highest-recall layout
+        assert (bands, rows) == (NUM_PERM, 1)
+    else:
+        assert candidate_probability(threshold, bands, rows) >= MIN_RECALL
+
+def test_rejects_bad_threshold():
+    with pytest.raises(ValueError):
+        MinHashIndex(0)
+
+@pytest.mark.skipif(not TEMPLATES, reason="no templates")
+@pytest.mark.parametrize('threshold', [0.3, 0.5, 0.8])
+def test_finds_what_brute_force_finds(threshold):
+    cards = [
+        (f"{template} › {deck} › card {idx + 1}", content)
+        for template, deck, contents in iter_decks(TEMPLATES)
+        for idx, content in enumerate(contents)
+    ]
+    index = MinHashIndex(threshold)
+    for key, content in cards:
+        index.add(key, content)
+    found = {(first, second) for first, second, _ in index.pairs()}
+
+    indexed = [(key, shingles(content)) for key, content in cards if len(re.findall(r'[a-z0-9]+', content.lower())) >= MIN_WORDS]
+    expected = {
+        (first, second)
+        for i, (first, a) in enumerate(indexed)
+        for second, b in indexed[i + 1:]
+        if jaccard(a, b) >= threshold
+    }
+    assert found == expected
+
+def test_groups_are_connected_components():
+    # A~B and B~C link A and C, though they aren't similar to each other
+    groups = group_pairs([('a', 'b', 0.9), ('b', 'c', 0.85), ('x', 'y', 0.95)])
+    assert groups == [
+        {'members': ['a', 'b', 'c'], 'similarity': 0.85},
+        {'members': ['x', 'y'], 'similarity': 0.95},
+    ]
+    lines = format_groups('cards', groups)
+    assert 'not every two members are similar' in lines[0]
+    assert lines[1] == "  3 cards, linked by pairs with similarity ≥ 0.85:"
@@ -0,0 +1,84 @@
+"""remote_validate.py against a local stub of /templates/validate."""
+
+import json
+from pathlib import Path
+
+from http_pool import ConnectionPool
+from remote_validate import RemoteResult, format_result, main, validate_remote
+
+def write_template(name):
+    """templates/cdx/<name>.json under the current directory, as the workflow passes them."""
+    path = Path('templates') / 'cdx' / f'{name}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'meta': {'id': name}, 'spaces': []}))
+    return str(path)
+
+def answer_by_template(responses):
+    """Route handler picking the response by the payload's template name."""
+    def handler(method, headers, body):
+        return responses[json.loads(body)['template']]
+    return handler
+
+RESPONSES = {
+    'good': (200, {'Content-Type': 'application/json'}, b'{"valid": true}'),
+    'bad': (200, {'Content-Type': 'application/json'}, b'{"valid": false, "errors": ["Missing meta.title"]}'),
+    'down': (503, {}, b'{"message": "maintenance"}'),
+    'broken': b'HTTP/1.1 banana\r\n\r\n',
+}
+
+def test_validate_remote_results(stub_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stub_server.routes['/templates/validate'] = answer_by_template(RESPONSES)
+    endpoint = f"{stub_server.url}/templates/validate"
+    files = {name: write_template(name) for name in RESPONSES}
+
+    with ConnectionPool(retries=1, backoff=0) as pool:
+        results = {name: validate_remote(pool, endpoint, file) for name, file in files.items()}
+
+    assert results['good'] == RemoteResult(files['good'], 200, True, [], '')
+    assert results['bad'] == RemoteResult(files['bad'], 200, False, ['Missing meta.title'], '')
+    assert results['down'] == RemoteResult(files['down'], 503, False, [], 'maintenance')
+    assert results['broken'].status is None and not results['broken'].valid
+
+    payload = json.loads(stub_server.requests[0][3])
+    assert (payload['org'], payload['template']) == ('cdx', 'good')
+
+def test_format_result_lines():
+    link = "[`t.json`](https://github.com/o/r/blob/abc/t.json)"
+    assert format_result(RemoteResult('t.json', 200, True, [], ''), 'o/r', 'abc') == f"✅ {link} - Valid"
+    assert format_result(RemoteResult('t.json', 200, False, ['a'], ''), 'o/r', 'abc') == (
+        f"❌ {link} - Invalid <details><summary>Errors</summary>- a  </details>"
+    )
+    assert format_result(RemoteResult('t.json', None, False, [], 'refused'), 'o/r', 'abc') == (
+        f"⚠️ {link} - Validation service error (HTTP 000) - refused"
+    )
+
+def test_main_writes_a_line_per_file_even_on_errors(stub_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stub_server.routes['/templates/validate'] = answer_by_template(RESPONSES)
+    files = [write_template(name) for name in RESPONSES]
+    results_file = tmp_path / 'results.txt'
+    github_output = tmp_path / 'github_output'
+    monkeypatch.setenv('GITHUB_OUTPUT', str(github_output))
+
+    status = main([
+        '--endpoint', f"{stub_server.url}/templates/validate", '--retries', '0',
+        '--results-file', str(results_file), '--repo', 'o/r', '--sha', 'abc', *files,
+    ])
+
+    assert status == 0
+    lines = results_file.read_text().splitlines()
+    assert [line[0] for line in lines] == ['✅', '❌', '⚠', '⚠']
+    assert 'HTTP 503' in lines[2] and 'HTTP 000' in lines[3]
+    assert github_output.read_text() == 'all_valid=false\n'
+
+def test_main_all_valid(stub_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stub_server.routes['/templates/validate'] = answer_by_template(RESPONSES)
+    github_output = tmp_path / 'github_output'
+    monkeypatch.setenv('GITHUB_OUTPUT', str(github_output))
+
+    main(['--endpoint', f"{stub_server.url}/templates/validate", '--results-file', str(tmp_path / 'results.txt'),
+          write_template('good')])
+
+    assert github_output.read_text() == 'all_valid=true\n'
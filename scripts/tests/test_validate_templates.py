@@ -0,0 +1,374 @@
+"""validate-templates.py parsing, the template model and watch-mode edge cases."""
+
+import io
+import json
+import re
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+TEMPLATES = sorted((Path(__file__).resolve().parents[2] / 'templates' / 'cdx').glob('*.json'))
+
+# Breaks most rules at least once, so both parsers are compared on every kind of finding
+VIOLATIONS = {
+    'tags': [{'tag': 'bug'}],
+    'spaces': [
+        {
+            'name': 'Design', 'icon': 'gdd', 'defaultDeckType': 'hero',
+            'decks': [
+                {
+                    'name': 'Combat', 'deckType': 'hero', 'coverFileUrl': 'combat.png',
+                    'cards': [
+                        {'content': 'Sword deals 80 damage', 'effort': 2},
+                        {'content': '# Heading\nFast at 7.5 m/s', 'effort': 0},
+                        {'content': 'Plain', 'subCards': [{'content': 'x'}]},
+                    ],
+                    'journey': {'steps': [
+                        {'content': 'Prototype the combat loop', 'tags': ['proto']},
+                        {'content': 'Polish', 'effort': 0.5},
+                    ]},
+                },
+                {
+                    'name': 'World', 'deckType': 'hero',
+                    'cards': [{'content': 'Map with 50% fog', 'effort': 1}, {'content': 'Biomes', 'effort': 3}],
+                },
+                {
+                    'name': 'Notes', 'deckType': 'doc', 'coverFileUrl': 'notes.png',
+                    'cards': [{'content': 'Only one'}],
+                },
+            ],
+        },
+        {
+            'name': 'Production', 'icon': 'tasks', 'defaultDeckType': 'task',
+            'decks': [
+                {'name': 'QA', 'deckType': 'task', 'autoTag': 'qa', 'coverFileUrl': 'qa.png',
+                 'preferredOrder': [], 'cards': [{'content': 'Crash', 'effort': 0, 'tags': ['bug']}]},
+                {'name': 'Art', 'coverFileUrl': 'art.png', 'cards': []},
+            ],
+        },
+    ],
+}
+
+@pytest.fixture
+def violations_path(tmp_path):
+    path = tmp_path / 'violations.json'
+    path.write_text(json.dumps(VIOLATIONS, ensure_ascii=False), encoding='utf-8')
+    return path
+
+def test_stream_reports_truncated_json_as_value_error(validator, tmp_path):
+    pytest.importorskip('ijson')
+    path = tmp_path / 'half-saved.json'
+    path.write_text('{"spaces": [')
+    # The watcher reports ValueError and keeps running, as with json.load
+    with pytest.raises(ValueError):
+        validator.Template.from_stream(path)
+
+def write_deck_template(tmp_path, cards):
+    path = tmp_path / 'template.json'
+    path.write_text(json.dumps({'spaces': [{'decks': [{'name': 'Bugs', 'cards': cards}]}]}))
+    return path
+
+def test_payload_is_only_measured_when_needed(validator, tmp_path):
+    cards = [{'content': '# Crash on load'}, {'content': 'Ünïcode 🐛', 'tags': ['bug']}]
+    path = write_deck_template(tmp_path, cards)
+
+    assert validator.validate_template(path)['instantiation']['payload_bytes'] is None
+    measured = validator.validate_template(path, payload=True)['instantiation']['payload_bytes']
+    assert measured == sum(validator.payload_size(card) for card in cards)
+
+    limited = validator.validate_template(path, limits={'payload_bytes': measured - 1})
+    assert 'instantiation-size' in [f['rule'] for f in limited['findings']]
+    assert 'instantiation-size' not in [f['rule'] for f in validator.validate_template(path)['findings']]
+
+    # Measuring is opt-in for the model too
+    template = validator.Template.from_dict(json.loads(path.read_text(encoding='utf-8')))
+    assert validator.simulate_instantiation(template)['payload_bytes'] is None
+
+def test_empty_limits_check_nothing(validator, tmp_path):
+    path = write_deck_template(tmp_path, [{'content': 'Card'}] * (validator.INSTANTIATION_LIMITS['cards'] + 1))
+    assert 'instantiation-size' in [f['rule'] for f in validator.validate_template(path)['findings']]
+    assert 'instantiation-size' not in [f['rule'] for f in validator.validate_template(path, limits={})['findings']]
+
+def test_stream_and_load_give_the_same_results(validator, violations_path):
+    pytest.importorskip('ijson')
+    for path in TEMPLATES + [violations_path]:
+        for payload in (False, True):
+            loaded = validator.validate_template(path, payload=payload)
+            streamed = validator.validate_template(path, stream=True, payload=payload)
+            # Findings carry the JSON path of every flagged card, so this also compares which cards were kept
+            assert streamed == loaded, path.name
+
+    flagged = [f['path'] for f in validator.validate_template(violations_path, stream=True)['findings']
+               if f['path'].startswith('$.spaces[0].decks[0].cards[')]
+    assert flagged == [
+        '$.spaces[0].decks[0].cards[0].content',
+        '$.spaces[0].decks[0].cards[1].content',
+        '$.spaces[0].decks[0].cards[1].content',
+        '$.spaces[0].decks[0].cards[1].effort',
+        '$.spaces[0].decks[0].cards[2].effort',
+    ]
+
+# What the validator reported for VIOLATIONS before rules ran on the Template model
+BASELINE_FINDINGS = [
+    ('warning', 'tags-defined', '$.tags', "Only 1 tags defined - templates should have 3-5 tags for better organization"),
+    ('warning', 'bug-tag-emoji', '$.tags[0].emoji', "Bug tag should have emoji='🐞' for visual identification"),
+    ('error', 'space-name', '$.spaces[0].name', "First space should be named 'Game Design Documents (GDD)', found 'Design'"),
+    ('error', 'gdd-deck-count', '$.spaces[0].decks', "Design: Should have at least 4 GDD decks (3+ hero + 1 doc), found 3"),
+    ('error', 'hero-card-count', '$.spaces[0].decks[0].cards', "Combat: Has 3 cards, should have at least 4"),
+    ('warning', 'hero-sub-cards', '$.spaces[0].decks[0].cards',
+     "Combat: Has 1 cards with sub-cards - these will be auto-generated once auto-trigger feature is added"),
+    ('warning', 'metric-damage', '$.spaces[0].decks[0].cards[0].content',
+     "Combat: Card 1 has metrics in content: '80 damage' at offset 12"),
+    ('warning', 'metric-speed', '$.spaces[0].decks[0].cards[1].content',
+     "Combat: Card 2 has metrics in content: '5 m/s' at offset 20"),
+    ('error', 'markdown-heading', '$.spaces[0].decks[0].cards[1].content', "Combat: Card 2 uses # markdown heading at offset 0"),
+    ('warning', 'hero-card-effort', '$.spaces[0].decks[0].cards[1].effort', "Combat: Hero card has effort < 1 (should be at least 1)"),
+    ('warning', 'hero-card-effort', '$.spaces[0].decks[0].cards[2].effort', "Combat: Hero card missing effort value"),
+    ('warning', 'journey-step-effort', '$.spaces[0].decks[0].journey.steps[0].effort',
+     "Combat: Journey step 'Prototype the combat loop...' missing effort"),
+    ('warning', 'journey-step-effort', '$.spaces[0].decks[0].journey.steps[1].effort', "Combat: Journey step has effort < 1"),
+    ('error', 'hero-card-count', '$.spaces[0].decks[1].cards', "World: Has 2 cards, should have at least 3"),
+    ('warning', 'doc-deck-cards', '$.spaces[0].decks[2].cards', "Notes: Doc deck should have at least 2-3 example cards"),
+    ('warning', 'doc-deck-name', '$.spaces[0].decks[2].name', "Notes: Doc deck should be named 'Design Notes' for consistency"),
+    ('error', 'deck-cover', '$.spaces[0].decks[1].coverFileUrl',
+     "World: Deck missing 'coverFileUrl' field - all decks should have a visual"),
+    ('error', 'production-deck-count', '$.spaces[1].decks',
+     "Production: Should have at least 5 Production decks (4 work + 1 QA), found 2"),
+    ('warning', 'qa-deck-auto-tag', '$.spaces[1].decks[0].autoTag', "QA: autoTag should be 'bug', found 'qa'"),
+    ('warning', 'qa-deck-name', '$.spaces[1].decks[0].name', "QA: QA deck should be named 'Bugs & QA' for consistency"),
+    ('warning', 'production-card-effort', '$.spaces[1].decks[0].cards[0].effort', "QA: Example card has effort < 1"),
+    ('error', 'production-deck-type', '$.spaces[1].decks[1].deckType', "Art: Production deck missing deckType='task'"),
+    ('error', 'deck-empty', '$.spaces[1].decks[1].cards', "Art: Empty deck (needs at least 1 card)"),
+    ('warning', 'deck-preferred-order', '$.spaces[1].decks[1]', "Art: Missing preferredOrder (recommended for task decks)"),
+]
+
+def test_model_rules_match_baseline_findings(validator):
+    findings = validator.check_template(validator.Template.from_dict(VIOLATIONS))
+    assert [(f['severity'], f['rule'], f['path'], f['message']) for f in findings] == BASELINE_FINDINGS
+
+def raw_flagged(validator, deck):
+    """Indices of a deck's cards the rules can report on, worked out from the JSON directly."""
+    flagged = []
+    for idx, card in enumerate(deck.get('cards', [])):
+        content = card.get('content', '')
+        # Content is only scanned for hero decks, and for decks without a type
+        scanned = deck.get('deckType') in (None, 'hero')
+        matches = scanned and any(re.search(rule.pattern, content, rule.flags) for rule in validator.CONTENT_RULES)
+        effort = card.get('effort')
+        if matches or effort is None or effort < 1:
+            flagged.append(idx)
+    return flagged
+
+@pytest.mark.skipif(not TEMPLATES, reason="no templates")
+def test_model_matches_template_json(validator):
+    for path in TEMPLATES:
+        data = json.loads(path.read_text(encoding='utf-8'))
+        template = validator.Template.from_dict(data)
+        assert template.has_tags == ('tags' in data) and template.tags == data.get('tags', [])
+        assert len(template.spaces) == len(data['spaces'])
+        for space, space_data in zip(template.spaces, data['spaces']):
+            assert (space.name, space.icon, space.default_deck_type) == (
+                space_data.get('name'), space_data.get('icon'), space_data.get('defaultDeckType'))
+            assert len(space.decks) == len(space_data['decks'])
+            for deck, deck_data in zip(space.decks, space_data['decks']):
+                cards = deck_data.get('cards', [])
+                assert (deck.name, deck.deck_type, deck.cover_file_url) == (
+                    deck_data.get('name'), deck_data.get('deckType'), deck_data.get('coverFileUrl'))
+                assert deck.has_preferred_order == ('preferredOrder' in deck_data)
+                assert deck.card_count == len(cards) == len(deck.cards)
+                assert deck.cards_with_subcards == sum(1 for card in cards if card.get('subCards'))
+                assert [card.index for card in deck.cards if card.flagged] == raw_flagged(validator, deck_data)
+                assert len(deck.journey_steps) == len(deck_data.get('journey', {}).get('steps', []))
+
+def test_stream_deck_keeps_only_flagged_cards(validator, violations_path):
+    pytest.importorskip('ijson')
+    loaded = validator.Template.from_dict(VIOLATIONS, payload=True)
+    streamed = validator.Template.from_stream(violations_path, payload=True)
+
+    kept = [[card.index for card in deck.cards] for space in streamed.spaces for deck in space.decks]
+    assert kept == [[0, 1, 2], [], [0], [0], []]
+    for space, streamed_space in zip(loaded.spaces, streamed.spaces):
+        for deck, streamed_deck in zip(space.decks, streamed_space.decks):
+            assert [card.index for card in deck.cards] == list(range(deck.card_count))
+            for name in ('card_count', 'cards_with_subcards', 'sub_card_count', 'tag_counts', 'payload_bytes'):
+                assert getattr(streamed_deck, name) == getattr(deck, name), (deck.name, name)
+
+def cached_run(validator, cache_file, paths, version):
+    """Validate paths through a cache and return the paths that were actually validated."""
+    cache = validator.ValidationCache(cache_file, version=version)
+    validated = [path for path in paths if cache.get(path) is None]
+    for _ in validator.iter_validate_templates(paths, cache=cache):
+        pass
+    return validated
+
+def test_cache_invalidation(validator, tmp_path, violations_path, monkeypatch):
+    cache_file = tmp_path / 'cache.json'
+    version = validator.cache_version(validator.INSTANTIATION_LIMITS)
+    assert cached_run(validator, cache_file, [violations_path], version) == [violations_path]
+    assert cached_run(validator, cache_file, [violations_path], version) == []
+
+    # A rules change bumps RULES_VERSION
+    with monkeypatch.context() as patched:
+        patched.setattr(validator, 'RULES_VERSION', validator.RULES_VERSION + '-next')
+        bumped = validator.cache_version(validator.INSTANTIATION_LIMITS)
+    assert bumped != version
+    assert cached_run(validator, cache_file, [violations_path], bumped) == [violations_path]
+
+    # Different limits, or measuring the payload, give another version
+    assert cached_run(validator, cache_file, [violations_path], version) == [violations_path]
+    limits = dict(validator.INSTANTIATION_LIMITS, cards=10)
+    assert validator.cache_version(limits) != version
+    assert validator.cache_version(limits) != validator.cache_version(dict(limits, cards=11))
+    assert validator.cache_version(validator.INSTANTIATION_LIMITS, payload=True) != version
+    assert cached_run(validator, cache_file, [violations_path], validator.cache_version(limits)) == [violations_path]
+    assert cached_run(validator, cache_file, [violations_path], validator.cache_version(limits)) == []
+
+    # Edited content
+    violations_path.write_text(json.dumps(dict(VIOLATIONS, tags=[])), encoding='utf-8')
+    assert cached_run(validator, cache_file, [violations_path], validator.cache_version(limits)) == [violations_path]
+
+def test_cache_forgets_deleted_templates(validator, tmp_path, violations_path):
+    cache_file = tmp_path / 'cache.json'
+    renamed = violations_path.with_name('renamed.json')
+    other = tmp_path / 'other.json'
+    other.write_text(json.dumps({'spaces': []}))
+    cached_run(validator, cache_file, [violations_path, other], '1')
+
+    violations_path.rename(renamed)
+    # Nothing new to validate; saving still drops the entry of the old name
+    cached_run(validator, cache_file, [other], '1')
+    data = json.loads(cache_file.read_text())
+    assert list(data['files']) == [str(other.resolve())]
+    assert len(data['results']) == 1
+
+def scan_directly(validator, rules, content):
+    """Every rule's regex run on its own, no prefilters: the lowest-priority hit per offset wins."""
+    found = {}
+    for priority, rule in enumerate(rules):
+        regex = re.compile(rule.pattern, rule.flags)
+        match = regex.search(content)
+        while match:
+            if match.start() not in found:
+                found[match.start()] = validator.ContentMatch(rule.id, rule.kind, match.start(), match.end(), match.group())
+            match = regex.search(content, match.start() + 1)
+    return [found[start] for start in sorted(found)]
+
+SCANNER_CONTENTS = [
+    '',
+    'No digits at all',
+    'Level 3 boss',  # the digit prefilter matches, no metric rule does
+    'Hits for 80 damage and 120 HP at 7.5 m/s, 20% of the time, every 1.5 seconds',
+    '# Heading\nBody\n# Another 50 RPM',
+    'Not a #heading, 5HP',
+]
+
+def test_scanner_matches_each_regex_run_directly(validator):
+    scanner = validator.ContentScanner(validator.CONTENT_RULES)
+    contents = SCANNER_CONTENTS + [
+        json.loads(path.read_text(encoding='utf-8'))['spaces'][0]['decks'][0]['cards'][0].get('content', '')
+        for path in TEMPLATES
+    ]
+    for content in contents:
+        assert scanner.scan(content) == scan_directly(validator, validator.CONTENT_RULES, content), content
+    assert scanner.scan('Level 3 boss') == []
+
+def test_scanner_priorities_and_offsets(validator):
+    ContentRule = validator.ContentRule
+    rules = [
+        ContentRule('hp', 'metric', r'\d+\s*HP', 0, r'\d'),
+        ContentRule('number', 'metric', r'\d+', 0, r'\d'),  # same prefilter and offset as 'hp', lower priority
+        ContentRule('heading', 'heading', r'^#\s', re.MULTILINE, r'^#'),
+        ContentRule('word', 'other', r'boss'),  # no prefilter: always runs
+    ]
+    content = '# Boss\n10 HP boss, 25 armor'
+    found = validator.ContentScanner(rules).scan(content)
+    assert found == scan_directly(validator, rules, content)
+    assert [(m.rule, m.start, m.end, m.text) for m in found] == [
+        ('heading', 0, 2, '# '),
+        ('hp', 7, 12, '10 HP'),  # 'number' matches here too but ranks lower
+        ('hp', 8, 12, '0 HP'),  # overlapping matches are reported too
+        ('word', 13, 17, 'boss'),
+        ('number', 19, 21, '25'),
+        ('number', 20, 21, '5'),
+    ]
+
+def report(validator, fmt, results):
+    """Run a reporter over (path, result) pairs and return its output."""
+    out = io.StringIO()
+    reporter = validator.REPORTERS[fmt](out)
+    reporter.start()
+    for path, result in results:
+        reporter.add(path, result)
+    reporter.finish(len(results), all(result['valid'] for _, result in results))
+    return out.getvalue()
+
+def legacy_text(results):
+    """The text output of validate-templates.py before reporters existed."""
+    lines = []
+    for result in results:
+        if result['issues'] or result['warnings']:
+            lines.append(f"\n{'❌' if result['issues'] else '⚠️'} {result['file']}")
+            lines.extend(f"  ERROR: {issue}" for issue in result['issues'])
+            lines.extend(f"  WARN:  {warning}" for warning in result['warnings'])
+        else:
+            lines.append(f"✅ {result['file']}")
+    if all(result['valid'] for result in results):
+        lines.append(f"\n✅ All {len(results)} templates passed validation!")
+    else:
+        lines.append("\n❌ Some templates have errors")
+    return ''.join(line + '\n' for line in lines)
+
+@pytest.fixture
+def reported(validator, violations_path, tmp_path):
+    """(path, result) for the violations template, a clean file and a warnings-only file."""
+    clean = tmp_path / 'clean.json'
+    clean.write_text('{}')
+    clean_result = dict(validator.validate_template(clean), issues=[], warnings=[], findings=[], valid=True)
+    warned_result = validator.validate_template(violations_path)
+    warned_result = dict(warned_result, findings=[f for f in warned_result['findings'] if f['severity'] == 'warning'],
+                         issues=[], valid=True)
+    return [
+        (Path('templates/cdx/violations.json'), validator.validate_template(violations_path)),
+        (Path('templates/cdx/clean.json'), clean_result),
+        (Path('templates/cdx/warned.json'), warned_result),
+    ]
+
+def test_text_output_is_unchanged(validator, reported, monkeypatch, capsys):
+    results = [result for _, result in reported]
+    assert report(validator, 'text', reported) == legacy_text(results)
+    assert report(validator, 'text', reported[1:]) == legacy_text(results[1:])
+
+    if TEMPLATES:
+        monkeypatch.chdir(TEMPLATES[0].parents[2])
+        validator.main(['--no-cache'])
+        assert capsys.readouterr().out == legacy_text([validator.validate_template(path) for path in TEMPLATES])
+
+def test_junit_output(validator, reported):
+    root = ElementTree.fromstring(report(validator, 'junit', reported))
+    assert root.tag == 'testsuites'
+    suites = root.findall('testsuite')
+    assert [suite.get('name') for suite in suites] == [path.as_posix() for path, _ in reported]
+    for suite, (path, result) in zip(suites, reported):
+        cases = suite.findall('testcase')
+        errors = [f for f in result['findings'] if f['severity'] == 'error']
+        assert len(cases) == int(suite.get('tests')) == max(1, len(result['findings']))
+        assert len(suite.findall('testcase/failure')) == int(suite.get('failures')) == len(errors)
+        assert [failure.get('message') for failure in suite.iter('failure')] == [f['message'] for f in errors]
+    assert [case.get('name') for case in suites[1]] == ['valid']
+
+def test_sarif_output(validator, reported):
+    log = json.loads(report(validator, 'sarif', reported))
+    assert log['version'] == '2.1.0'
+    run, = log['runs']
+    rule_ids = [rule['id'] for rule in run['tool']['driver']['rules']]
+    assert rule_ids == list(validator.RULES)
+
+    findings = [(path, f) for path, result in reported for f in result['findings']]
+    assert len(run['results']) == len(findings)
+    for sarif_result, (path, finding) in zip(run['results'], findings):
+        assert sarif_result['ruleId'] == finding['rule'] and sarif_result['ruleId'] in rule_ids
+        assert sarif_result['level'] == finding['severity']
+        location, = sarif_result['locations']
+        assert location['physicalLocation']['artifactLocation']['uri'] == path.as_posix()
+        assert location['logicalLocations'] == [{'fullyQualifiedName': finding['path']}]
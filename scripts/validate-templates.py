@@ -11,254 +11,1263 @@ Rules:
 - Spaces must have correct icons
 """
 
+import argparse
+import hashlib
 import json
+import os
 import re
+import select
+import struct
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, TextIO, Tuple
+from xml.sax.saxutils import escape, quoteattr
 
-def check_metrics_in_content(content: str) -> List[str]:
-    """Check for specific numeric metrics in content."""
-    issues = []
+from near_duplicates import (
+    DEFAULT_THRESHOLD as NEAR_DUPLICATE_THRESHOLD, find_near_duplicates, format_groups, parse_threshold,
+)
+from profiling import PROFILER, Profiler
+
+# Bump whenever a rule or message changes, so cached results are discarded
+RULES_VERSION = '4'
+
+DEFAULT_CACHE_FILE = Path('.validate-templates-cache.json')
+
+class ContentRule(NamedTuple):
+    """A regex rule applied to card content.
 
+    `prefilter` is a cheaper regex (compiled with the same flags) that must
+    match somewhere in the content for the rule to be able to match at all.
+    """
+    id: str
+    kind: str
+    pattern: str
+    flags: int = 0
+    prefilter: Optional[str] = None
+
+class ContentMatch(NamedTuple):
+    """A single rule match inside a card's content."""
+    rule: str
+    kind: str
+    start: int
+    end: int
+    text: str
+
+# All content rules, in priority order. When two rules match at the same
+# offset only the first one is reported.
+CONTENT_RULES = [
     # Patterns that indicate specific metrics
-    metric_patterns = [
-        r'\b\d+\s*HP\b',
-        r'\b\d+\s*damage\b',
-        r'\b\d+\s*m/s\b',
-        r'\b\d+\s*RPM\b',
-        r'\b\d+%\b',
-        r'\b\d+\.\d+\s*seconds?\b',
+    ContentRule('metric-hp', 'metric', r'\b\d+\s*HP\b', re.IGNORECASE, r'\d'),
+    ContentRule('metric-damage', 'metric', r'\b\d+\s*damage\b', re.IGNORECASE, r'\d'),
+    ContentRule('metric-speed', 'metric', r'\b\d+\s*m/s\b', re.IGNORECASE, r'\d'),
+    ContentRule('metric-rpm', 'metric', r'\b\d+\s*RPM\b', re.IGNORECASE, r'\d'),
+    ContentRule('metric-percent', 'metric', r'\b\d+%\b', re.IGNORECASE, r'\d'),
+    ContentRule('metric-seconds', 'metric', r'\b\d+\.\d+\s*seconds?\b', re.IGNORECASE, r'\d'),
+    # Codecks uses the first line as the card title, so no # headings
+    ContentRule('markdown-heading', 'heading', r'^#\s+\w', re.MULTILINE, r'^#'),
+]
+
+class ContentScanner:
+    """Runs content rules over a card, skipping rules whose prefilter fails.
+
+    Rules sharing a prefilter are grouped, so a card without digits costs a
+    single search for all metric rules. Each rule keeps its own compiled
+    regex, which keeps the regex engine's literal-prefix optimizations that
+    one combined alternation would lose.
+    """
+
+    def __init__(self, rules: List[ContentRule]):
+        groups = {}  # (prefilter, flags) -> [(priority, rule, regex)]
+        for priority, rule in enumerate(rules):
+            key = (rule.prefilter, rule.flags)
+            groups.setdefault(key, []).append((priority, rule, re.compile(rule.pattern, rule.flags)))
+        # [(compiled prefilter or None, entries)]
+        self.groups = [
+            (re.compile(prefilter, flags) if prefilter else None, entries)
+            for (prefilter, flags), entries in groups.items()
+        ]
+
+    def scan(self, content: str) -> List[ContentMatch]:
+        """Return every rule match in `content`, ordered by offset."""
+        found = {}  # start -> (priority, rule, match)
+        for prefilter, entries in self.groups:
+            if prefilter is not None and not prefilter.search(content):
+                continue
+            for priority, rule, regex in entries:
+                match = regex.search(content)
+                while match:
+                    best = found.get(match.start())
+                    if best is None or priority < best[0]:
+                        found[match.start()] = (priority, rule, match)
+                    # Search again from the next offset, so overlapping matches are found too
+                    match = regex.search(content, match.start() + 1)
+        return [
+            ContentMatch(rule.id, rule.kind, match.start(), match.end(), match.group())
+            for _, rule, match in (found[start] for start in sorted(found))
+        ]
+
+CONTENT_SCANNER = ContentScanner(CONTENT_RULES)
+
+def scan_content(content: str) -> List[ContentMatch]:
+    """Run all content rules over a card's content, ordered by offset."""
+    if not content:
+        return []
+    return CONTENT_SCANNER.scan(content)
+
+def check_metrics_in_content(content: str) -> List[str]:
+    """Check for specific numeric metrics in content."""
+    return [
+        f"Found specific metric '{m.text}' at offset {m.start} ({m.rule})"
+        for m in scan_content(content) if m.kind == 'metric'
     ]
 
-    for pattern in metric_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            issues.append(f"Found specific metric: {pattern}")
+class Card:
+    """A card, reduced to what the rules need. Content is scanned once on load."""
+    __slots__ = ('index', 'effort', 'sub_card_count', 'matches')
+
+    def __init__(self, index: int, effort=None, sub_card_count: int = 0, matches: Tuple[ContentMatch, ...] = ()):
+        self.index = index
+        self.effort = effort
+        self.sub_card_count = sub_card_count
+        self.matches = matches
+
+    @classmethod
+    def from_dict(cls, data: Dict, index: int, scan: bool = True) -> 'Card':
+        if scan:
+            with PROFILER.stage('content-scan'):
+                matches = tuple(scan_content(data.get('content', '')))
+        else:
+            matches = ()
+        return cls(index, data.get('effort'), len(data.get('subCards') or []), matches)
+
+    @property
+    def effort_state(self) -> Optional[str]:
+        """'missing' or 'low' if the effort is absent or < 1, else None."""
+        if self.effort is None:
+            return 'missing'
+        if self.effort < 1:
+            return 'low'
+        return None
+
+    @property
+    def flagged(self) -> bool:
+        """Whether any rule could report something about this card."""
+        return bool(self.matches) or self.effort_state is not None
+
+    def first_match(self, kind: str) -> Optional[ContentMatch]:
+        """Return the first content match of a kind ('metric', 'heading')."""
+        return next((m for m in self.matches if m.kind == kind), None)
+
+def payload_size(data) -> int:
+    """Bytes of an object serialized as compact JSON, as a workspace would receive it."""
+    text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    # isascii() is a flag check, much cheaper than encoding just to count bytes
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+def total_payload_size(items: List[Dict]) -> int:
+    """Sum of payload_size() over items, serialized in a single call."""
+    if not items:
+        return 0
+    # A compact list is '[' + the items joined by ',' + ']'
+    return payload_size(items) - len(items) - 1
+
+class JourneyStep:
+    """A step of a hero deck's journey."""
+    __slots__ = ('index', 'content', 'effort', 'tag_count', 'payload_bytes')
+
+    def __init__(self, index: int, content: str = '', effort=None, tag_count: int = 0, payload_bytes: int = 0):
+        self.index = index
+        self.content = content
+        self.effort = effort
+        self.tag_count = tag_count
+        self.payload_bytes = payload_bytes
+
+    @classmethod
+    def from_dict(cls, data: Dict, index: int, payload: bool = False) -> 'JourneyStep':
+        return cls(index, data.get('content', ''), data.get('effort'), len(data.get('tags') or []),
+                   payload_size(data) if payload else None)
+
+    effort_state = Card.effort_state
+
+class Deck:
+    """A deck with its cards and journey steps.
+
+    `card_count`, `cards_with_subcards` and the instantiation totals
+    (`sub_card_count`, `tag_counts`, `payload_bytes`) always cover every card.
+    `cards` holds every card unless `keep_cards` is False (streaming), in
+    which case only flagged cards are kept so memory doesn't grow with the deck.
+    `payload_bytes` is None unless `payload` is set, since measuring it
+    serializes every card.
+    """
+    __slots__ = (
+        'index', 'name', 'deck_type', 'cover_file_url', 'auto_tag', 'has_auto_tag',
+        'has_preferred_order', 'card_count', 'cards_with_subcards', 'cards', 'journey_steps', 'keep_cards',
+        'sub_card_count', 'tag_counts', 'payload_bytes',
+    )
+
+    # JSON keys copied onto attributes
+    FIELDS = {'name': 'name', 'deckType': 'deck_type', 'coverFileUrl': 'cover_file_url', 'autoTag': 'auto_tag'}
+
+    def __init__(self, index: int, keep_cards: bool = True, payload: bool = False):
+        self.index = index
+        self.name = None
+        self.deck_type = None
+        self.cover_file_url = None
+        self.auto_tag = None
+        self.has_auto_tag = False
+        self.has_preferred_order = False
+        self.card_count = 0
+        self.cards_with_subcards = 0
+        self.cards = []
+        self.journey_steps = []
+        self.keep_cards = keep_cards
+        self.sub_card_count = 0
+        self.tag_counts = {}  # tag -> number of cards that have it
+        self.payload_bytes = 0 if payload else None
+
+    @classmethod
+    def from_dict(cls, data: Dict, index: int, payload: bool = False) -> 'Deck':
+        deck = cls(index, payload=payload)
+        for key in data:
+            deck.set_field(key, data[key])
+        cards = data.get('cards', [])
+        for card in cards:
+            deck.add_card(card, payload=False)
+        if payload:
+            deck.payload_bytes += total_payload_size(cards)
+        for step in data.get('journey', {}).get('steps', []):
+            deck.journey_steps.append(JourneyStep.from_dict(step, len(deck.journey_steps), payload=payload))
+        return deck
+
+    def set_field(self, key: str, value):
+        """Apply a top-level deck key from the JSON."""
+        if key == 'autoTag':
+            self.has_auto_tag = True
+        elif key == 'preferredOrder':
+            self.has_preferred_order = True
+        if key in self.FIELDS:
+            setattr(self, self.FIELDS[key], value)
+
+    def add_card(self, data: Dict, payload: bool = True):
+        """Parse a card and add it to the deck.
+
+        With `payload` False the caller adds the card's payload size itself,
+        e.g. for all cards of a deck at once.
+        """
+        # Content rules only apply to hero decks; scan if the type isn't known yet
+        card = Card.from_dict(data, self.card_count, scan=self.deck_type in (None, 'hero'))
+        self.card_count += 1
+        if card.sub_card_count > 0:
+            self.cards_with_subcards += 1
+        self.sub_card_count += card.sub_card_count
+        for tag in data.get('tags') or []:
+            self.tag_counts[tag] = self.tag_counts.get(tag, 0) + 1
+        if payload and self.payload_bytes is not None:
+            self.payload_bytes += payload_size(data)
+        if self.keep_cards or card.flagged:
+            self.cards.append(card)
+
+class Space:
+    """A space and its decks."""
+    __slots__ = ('index', 'name', 'icon', 'default_deck_type', 'decks')
 
-    return issues
+    FIELDS = {'name': 'name', 'icon': 'icon', 'defaultDeckType': 'default_deck_type'}
 
-def validate_template(filepath: Path) -> Dict:
-    """Validate a single template file."""
-    with open(filepath) as f:
-        template = json.load(f)
+    def __init__(self, index: int):
+        self.index = index
+        self.name = f'Space {index}'
+        self.icon = None
+        self.default_deck_type = None
+        self.decks = []
 
-    issues = []
-    warnings = []
+    @classmethod
+    def from_dict(cls, data: Dict, index: int, payload: bool = False) -> 'Space':
+        space = cls(index)
+        for key in data:
+            space.set_field(key, data[key])
+        space.decks = [Deck.from_dict(deck, idx, payload=payload) for idx, deck in enumerate(data.get('decks', []))]
+        return space
+
+    def set_field(self, key: str, value):
+        """Apply a top-level space key from the JSON."""
+        if key in self.FIELDS:
+            setattr(self, self.FIELDS[key], value)
+
+class Template:
+    """A parsed template. Built once per file and shared by all rules."""
+    __slots__ = ('has_tags', 'tags', 'spaces')
+
+    def __init__(self):
+        self.has_tags = False
+        self.tags = []
+        self.spaces = []
+
+    @classmethod
+    def from_dict(cls, data: Dict, payload: bool = False) -> 'Template':
+        """Build a template; without `payload`, card payload sizes aren't measured."""
+        template = cls()
+        template.has_tags = 'tags' in data
+        template.tags = data.get('tags', [])
+        template.spaces = [Space.from_dict(space, idx, payload=payload) for idx, space in enumerate(data.get('spaces', []))]
+        return template
+
+    @classmethod
+    def from_file(cls, filepath: Path, payload: bool = False) -> 'Template':
+        with open(filepath) as f:
+            return cls.from_dict(json.load(f), payload=payload)
+
+    @classmethod
+    def from_stream(cls, filepath: Path, payload: bool = False) -> 'Template':
+        """Build a template while parsing the file incrementally.
+
+        Only one card or journey step is held as raw JSON at a time, and decks
+        keep only flagged cards, so peak memory depends on the number of decks
+        rather than on the size of the file. Requires ijson (pip install ijson).
+        """
+        try:
+            import ijson
+        except ImportError:
+            raise RuntimeError("Streaming mode requires ijson: pip install ijson") from None
+
+        def parse(f):
+            # Report broken JSON as ValueError, like json.load does
+            try:
+                yield from ijson.parse(f, use_float=True)
+            except ijson.JSONError as e:
+                raise ValueError(str(e)) from e
+
+        space_prefix = 'spaces.item'
+        deck_prefix = 'spaces.item.decks.item'
+        card_prefix = 'spaces.item.decks.item.cards.item'
+        step_prefix = 'spaces.item.decks.item.journey.steps.item'
+
+        template = cls()
+        space = deck = None
+        builder = builder_prefix = None
+
+        with open(filepath, 'rb') as f:
+            for prefix, event, value in parse(f):
+                # Feed events to the object currently being built (card, step or tags)
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == builder_prefix and event in ('end_map', 'end_array'):
+                        if builder_prefix == card_prefix:
+                            deck.add_card(builder.value)
+                        elif builder_prefix == step_prefix:
+                            deck.journey_steps.append(JourneyStep.from_dict(builder.value, len(deck.journey_steps), payload))
+                        else:
+                            template.tags = builder.value
+                        builder = builder_prefix = None
+                    continue
+
+                if event in ('start_map', 'start_array') and prefix in (card_prefix, step_prefix, 'tags'):
+                    if prefix == 'tags':
+                        template.has_tags = True
+                    builder = ijson.ObjectBuilder()
+                    builder_prefix = prefix
+                    builder.event(event, value)
+                elif prefix == space_prefix and event == 'start_map':
+                    space = Space(len(template.spaces))
+                    template.spaces.append(space)
+                elif prefix == deck_prefix and event == 'start_map':
+                    deck = Deck(len(space.decks), keep_cards=False, payload=payload)
+                    space.decks.append(deck)
+                elif event == 'map_key' and prefix == deck_prefix:
+                    # Records presence of keys like preferredOrder; values follow below
+                    deck.set_field(value, None)
+                elif event in ('string', 'number', 'boolean', 'null'):
+                    parent, _, key = prefix.rpartition('.')
+                    if parent == deck_prefix:
+                        deck.set_field(key, value)
+                    elif parent == space_prefix:
+                        space.set_field(key, value)
+
+        return template
+
+# Rule IDs used in machine-readable reports, with a short description each
+RULES = {
+    'space-count': "Templates have exactly 2 spaces (GDD + Production)",
+    'tags-defined': "Templates define 3-5 tags",
+    'bug-tag': "A 'bug' tag exists for the Bugs & QA deck autoTag",
+    'bug-tag-emoji': "The 'bug' tag has an emoji",
+    'space-name': "Spaces are named 'Game Design Documents (GDD)' and 'Production'",
+    'space-icon': "Spaces use the 'gdd' and 'tasks' icons",
+    'space-default-deck-type': "Spaces use the 'hero' and 'task' default deck types",
+    'gdd-deck-count': "The GDD space has 4-6 decks",
+    'gdd-doc-deck': "The GDD space has exactly 1 doc deck",
+    'hero-card-count': "Hero decks follow the 4, 3, 3, 2 card count pattern",
+    'hero-sub-cards': "Hero cards have no sub-cards until auto-trigger ships",
+    'hero-card-effort': "Hero cards have an effort of at least 1",
+    'journey-step-effort': "Journey steps have an effort of at least 1",
+    'doc-deck-cards': "The doc deck has 2-3 example cards",
+    'doc-deck-name': "The doc deck is named 'Design Notes'",
+    'deck-cover': "Every deck has a coverFileUrl",
+    'production-deck-count': "The Production space has 5-7 decks",
+    'qa-deck': "The Production space has exactly 1 Bugs & QA deck",
+    'qa-deck-auto-tag': "The QA deck has autoTag='bug'",
+    'qa-deck-name': "The QA deck is named 'Bugs & QA'",
+    'production-deck-type': "Production decks have deckType='task'",
+    'deck-empty': "Production decks have at least 1 card",
+    'deck-preferred-order': "Production decks have a preferredOrder",
+    'production-card-effort': "Production example cards have an effort of at least 1",
+    'instantiation-size': "Instantiating the template stays within INSTANTIATION_LIMITS",
+}
+RULES.update({rule.id: f"Card content matches {rule.pattern}" for rule in CONTENT_RULES})
+
+class Findings:
+    """Collects the findings of one template, each with a rule ID and JSON path."""
+
+    def __init__(self):
+        self.items = []
+
+    def error(self, rule: str, path: str, message: str):
+        self.items.append({'rule': rule, 'severity': 'error', 'path': path, 'message': message})
+
+    def warning(self, rule: str, path: str, message: str):
+        self.items.append({'rule': rule, 'severity': 'warning', 'path': path, 'message': message})
+
+def check_template(template: Template) -> List[Dict]:
+    """Run all rules against a parsed template and return its findings."""
+    report = Findings()
 
     # Check spaces
-    if len(template.get('spaces', [])) != 2:
-        issues.append(f"Should have exactly 2 spaces, found {len(template.get('spaces', []))}")
+    if len(template.spaces) != 2:
+        report.error('space-count', '$.spaces', f"Should have exactly 2 spaces, found {len(template.spaces)}")
+    PROFILER.lap('space-count')
 
     # Check tags exist
-    if 'tags' not in template or len(template.get('tags', [])) == 0:
-        warnings.append("No tags defined - templates should have tags for organization")
-    elif len(template.get('tags', [])) < 3:
-        warnings.append(f"Only {len(template.get('tags', []))} tags defined - templates should have 3-5 tags for better organization")
+    tags = template.tags
+    if not template.has_tags or len(tags) == 0:
+        report.warning('tags-defined', '$.tags', "No tags defined - templates should have tags for organization")
+    elif len(tags) < 3:
+        report.warning('tags-defined', '$.tags', f"Only {len(tags)} tags defined - templates should have 3-5 tags for better organization")
+    PROFILER.lap('tags-defined')
 
     # Check bug tag exists (required for QA deck)
-    tags = template.get('tags', [])
-    has_bug_tag = any(t.get('tag') == 'bug' for t in tags)
-    if not has_bug_tag:
-        issues.append("Missing 'bug' tag - required for Bugs & QA deck autoTag feature")
+    bug_tag_idx = next((idx for idx, t in enumerate(tags) if t.get('tag') == 'bug'), None)
+    if bug_tag_idx is None:
+        report.error('bug-tag', '$.tags', "Missing 'bug' tag - required for Bugs & QA deck autoTag feature")
     else:
         # Check bug tag has emoji
-        bug_tag = next(t for t in tags if t.get('tag') == 'bug')
-        if not bug_tag.get('emoji'):
-            warnings.append("Bug tag should have emoji='🐞' for visual identification")
+        if not tags[bug_tag_idx].get('emoji'):
+            report.warning('bug-tag-emoji', f'$.tags[{bug_tag_idx}].emoji', "Bug tag should have emoji='🐞' for visual identification")
+    PROFILER.lap('bug-tag')
 
-    for space_idx, space in enumerate(template.get('spaces', [])):
-        space_name = space.get('name', f'Space {space_idx}')
+    for space in template.spaces:
+        space_name = space.name
+        space_path = f'$.spaces[{space.index}]'
 
         # Check space names are consistent
-        if space_idx == 0 and space_name != 'Game Design Documents (GDD)':
-            issues.append(f"First space should be named 'Game Design Documents (GDD)', found '{space_name}'")
-        if space_idx == 1 and space_name != 'Production':
-            issues.append(f"Second space should be named 'Production', found '{space_name}'")
+        if space.index == 0 and space_name != 'Game Design Documents (GDD)':
+            report.error('space-name', f'{space_path}.name', f"First space should be named 'Game Design Documents (GDD)', found '{space_name}'")
+        if space.index == 1 and space_name != 'Production':
+            report.error('space-name', f'{space_path}.name', f"Second space should be named 'Production', found '{space_name}'")
+        PROFILER.lap('space-name')
 
         # Check icons and default deck types
-        if space_idx == 0:
-            if space.get('icon') != 'gdd':
-                issues.append(f"{space_name}: GDD space should have icon='gdd'")
-            if space.get('defaultDeckType') != 'hero':
-                issues.append(f"{space_name}: GDD space should have defaultDeckType='hero'")
-        if space_idx == 1:
-            if space.get('icon') != 'tasks':
-                issues.append(f"{space_name}: Production space should have icon='tasks'")
-            if space.get('defaultDeckType') != 'task':
-                issues.append(f"{space_name}: Production space should have defaultDeckType='task'")
+        if space.index == 0:
+            if space.icon != 'gdd':
+                report.error('space-icon', f'{space_path}.icon', f"{space_name}: GDD space should have icon='gdd'")
+            if space.default_deck_type != 'hero':
+                report.error('space-default-deck-type', f'{space_path}.defaultDeckType', f"{space_name}: GDD space should have defaultDeckType='hero'")
+        if space.index == 1:
+            if space.icon != 'tasks':
+                report.error('space-icon', f'{space_path}.icon', f"{space_name}: Production space should have icon='tasks'")
+            if space.default_deck_type != 'task':
+                report.error('space-default-deck-type', f'{space_path}.defaultDeckType', f"{space_name}: Production space should have defaultDeckType='task'")
+        PROFILER.lap('space-icon')
 
         # Check GDD decks
-        if space.get('icon') == 'gdd' or space.get('defaultDeckType') == 'hero':
-            decks = space.get('decks', [])
+        if space.icon == 'gdd' or space.default_deck_type == 'hero':
+            decks = space.decks
 
             # Check minimum deck count (3-5 hero decks + 1 doc deck = 4-6 total)
             if len(decks) < 4:
-                issues.append(f"{space_name}: Should have at least 4 GDD decks (3+ hero + 1 doc), found {len(decks)}")
+                report.error('gdd-deck-count', f'{space_path}.decks', f"{space_name}: Should have at least 4 GDD decks (3+ hero + 1 doc), found {len(decks)}")
+            PROFILER.lap('gdd-deck-count')
 
             # Check for exactly 1 doc deck
-            doc_decks = [d for d in decks if d.get('deckType') == 'doc']
+            doc_decks = [d for d in decks if d.deck_type == 'doc']
             if len(doc_decks) == 0:
-                issues.append(f"{space_name}: Missing doc deck (should have exactly 1 deck with deckType='doc')")
+                report.error('gdd-doc-deck', f'{space_path}.decks', f"{space_name}: Missing doc deck (should have exactly 1 deck with deckType='doc')")
             elif len(doc_decks) > 1:
-                warnings.append(f"{space_name}: Has {len(doc_decks)} doc decks, should have exactly 1")
+                report.warning('gdd-doc-deck', f'{space_path}.decks', f"{space_name}: Has {len(doc_decks)} doc decks, should have exactly 1")
             if len(decks) > 5:
-                warnings.append(f"{space_name}: Has {len(decks)} GDD decks, recommended 3-5")
+                report.warning('gdd-deck-count', f'{space_path}.decks', f"{space_name}: Has {len(decks)} GDD decks, recommended 3-5")
+            PROFILER.lap('gdd-doc-deck')
 
             # Check card count pattern (4, 3, 3, 2) - only for hero decks
-            hero_decks = [d for d in decks if d.get('deckType') == 'hero']
+            hero_decks = [d for d in decks if d.deck_type == 'hero']
             expected_cards = [4, 3, 3, 2]
             for deck_idx, deck in enumerate(hero_decks):
-                cards = deck.get('cards', [])
+                deck_path = f'{space_path}.decks[{deck.index}]'
+                card_count = deck.card_count
 
                 # Hero decks should follow card count pattern
 
                 # Check card count - stricter now
                 if deck_idx < len(expected_cards):
                     expected = expected_cards[deck_idx]
-                    if len(cards) < expected:
-                        issues.append(f"{deck.get('name')}: Has {len(cards)} cards, should have at least {expected}")
-                    elif len(cards) < expected - 1:
-                        warnings.append(f"{deck.get('name')}: Has {len(cards)} cards, expected ~{expected}")
+                    if card_count < expected:
+                        report.error('hero-card-count', f'{deck_path}.cards', f"{deck.name}: Has {card_count} cards, should have at least {expected}")
+                    elif card_count < expected - 1:
+                        report.warning('hero-card-count', f'{deck_path}.cards', f"{deck.name}: Has {card_count} cards, expected ~{expected}")
+                PROFILER.lap('hero-card-count')
 
                 # Check sub-cards (DISABLED - waiting for auto-trigger journey feature)
                 # Once auto-trigger is implemented, hero cards will have sub-cards automatically created
                 # For now, templates should have empty subCards arrays
-                cards_with_subcards = sum(1 for card in cards if card.get('subCards') and len(card.get('subCards', [])) > 0)
-                if cards_with_subcards > 0:
-                    warnings.append(f"{deck.get('name')}: Has {cards_with_subcards} cards with sub-cards - these will be auto-generated once auto-trigger feature is added")
-
-                # Check for metrics in content
-                for card in cards:
-                    content = card.get('content', '')
-                    metric_issues = check_metrics_in_content(content)
-                    if metric_issues:
-                        warnings.append(f"{deck.get('name')}: Card has metrics in content")
-
-                # Check for # markdown headings
-                for card in cards:
-                    content = card.get('content', '')
-                    if re.search(r'^#\s+\w', content, re.MULTILINE):
-                        issues.append(f"{deck.get('name')}: Card uses # markdown heading")
+                if deck.cards_with_subcards > 0:
+                    report.warning('hero-sub-cards', f'{deck_path}.cards', f"{deck.name}: Has {deck.cards_with_subcards} cards with sub-cards - these will be auto-generated once auto-trigger feature is added")
+                PROFILER.lap('hero-sub-cards')
+
+                # Check content rules (metrics, headings), scanned once per card on load
+                for card in deck.cards:
+                    content_path = f'{deck_path}.cards[{card.index}].content'
+                    metric = card.first_match('metric')
+                    if metric:
+                        report.warning(metric.rule, content_path, f"{deck.name}: Card {card.index + 1} has metrics in content: '{metric.text}' at offset {metric.start}")
+                    heading = card.first_match('heading')
+                    if heading:
+                        report.error(heading.rule, content_path, f"{deck.name}: Card {card.index + 1} uses # markdown heading at offset {heading.start}")
+                PROFILER.lap('content-rules')
 
                 # Check effort on hero cards
-                for card in cards:
-                    if 'effort' not in card or card.get('effort') is None:
-                        warnings.append(f"{deck.get('name')}: Hero card missing effort value")
-                    elif card.get('effort', 0) < 1:
-                        warnings.append(f"{deck.get('name')}: Hero card has effort < 1 (should be at least 1)")
+                for card in deck.cards:
+                    effort_path = f'{deck_path}.cards[{card.index}].effort'
+                    if card.effort_state == 'missing':
+                        report.warning('hero-card-effort', effort_path, f"{deck.name}: Hero card missing effort value")
+                    elif card.effort_state == 'low':
+                        report.warning('hero-card-effort', effort_path, f"{deck.name}: Hero card has effort < 1 (should be at least 1)")
+                PROFILER.lap('hero-card-effort')
 
                 # Check effort on journey steps
-                journey_steps = deck.get('journey', {}).get('steps', [])
-                for step in journey_steps:
-                    if 'effort' not in step or step.get('effort') is None:
-                        warnings.append(f"{deck.get('name')}: Journey step '{step.get('content', '')[:40]}...' missing effort")
-                    elif step.get('effort', 0) < 1:
-                        warnings.append(f"{deck.get('name')}: Journey step has effort < 1")
+                for step in deck.journey_steps:
+                    effort_path = f'{deck_path}.journey.steps[{step.index}].effort'
+                    if step.effort_state == 'missing':
+                        report.warning('journey-step-effort', effort_path, f"{deck.name}: Journey step '{step.content[:40]}...' missing effort")
+                    elif step.effort_state == 'low':
+                        report.warning('journey-step-effort', effort_path, f"{deck.name}: Journey step has effort < 1")
+                PROFILER.lap('journey-step-effort')
 
             # Check doc deck
             for deck in doc_decks:
-                if len(deck.get('cards', [])) < 2:
-                    warnings.append(f"{deck.get('name')}: Doc deck should have at least 2-3 example cards")
-                if deck.get('name') != 'Design Notes':
-                    warnings.append(f"{deck.get('name')}: Doc deck should be named 'Design Notes' for consistency")
+                deck_path = f'{space_path}.decks[{deck.index}]'
+                if deck.card_count < 2:
+                    report.warning('doc-deck-cards', f'{deck_path}.cards', f"{deck.name}: Doc deck should have at least 2-3 example cards")
+                if deck.name != 'Design Notes':
+                    report.warning('doc-deck-name', f'{deck_path}.name', f"{deck.name}: Doc deck should be named 'Design Notes' for consistency")
+            PROFILER.lap('doc-deck')
 
             # Check deck images for all decks in GDD space
             for deck in decks:
-                if 'coverFileUrl' not in deck or not deck.get('coverFileUrl'):
-                    issues.append(f"{deck.get('name')}: Deck missing 'coverFileUrl' field - all decks should have a visual")
+                if not deck.cover_file_url:
+                    report.error('deck-cover', f'{space_path}.decks[{deck.index}].coverFileUrl', f"{deck.name}: Deck missing 'coverFileUrl' field - all decks should have a visual")
+            PROFILER.lap('deck-cover')
 
         # Check Production decks
-        elif space.get('icon') == 'tasks' or space.get('defaultDeckType') == 'task':
-            decks = space.get('decks', [])
+        elif space.icon == 'tasks' or space.default_deck_type == 'task':
+            decks = space.decks
 
             # Check minimum deck count (including mandatory Bugs & QA)
             if len(decks) < 5:
-                issues.append(f"{space_name}: Should have at least 5 Production decks (4 work + 1 QA), found {len(decks)}")
+                report.error('production-deck-count', f'{space_path}.decks', f"{space_name}: Should have at least 5 Production decks (4 work + 1 QA), found {len(decks)}")
             if len(decks) > 7:
-                warnings.append(f"{space_name}: Has {len(decks)} Production decks, recommended 5-7")
+                report.warning('production-deck-count', f'{space_path}.decks', f"{space_name}: Has {len(decks)} Production decks, recommended 5-7")
+            PROFILER.lap('production-deck-count')
 
             # Check for Bugs & QA deck
-            qa_decks = [d for d in decks if 'Bug' in d.get('name', '') or 'QA' in d.get('name', '')]
+            qa_decks = [d for d in decks if 'Bug' in (d.name or '') or 'QA' in (d.name or '')]
             if len(qa_decks) == 0:
-                issues.append(f"{space_name}: Missing 'Bugs & QA' deck - all templates should have a QA deck")
+                report.error('qa-deck', f'{space_path}.decks', f"{space_name}: Missing 'Bugs & QA' deck - all templates should have a QA deck")
             elif len(qa_decks) > 1:
-                warnings.append(f"{space_name}: Has {len(qa_decks)} QA decks, should have exactly 1")
+                report.warning('qa-deck', f'{space_path}.decks', f"{space_name}: Has {len(qa_decks)} QA decks, should have exactly 1")
             else:
                 # Check QA deck has autoTag
                 qa_deck = qa_decks[0]
-                if 'autoTag' not in qa_deck:
-                    warnings.append(f"{qa_deck.get('name')}: QA deck should have autoTag='bug' to automatically tag all cards")
-                elif qa_deck.get('autoTag') != 'bug':
-                    warnings.append(f"{qa_deck.get('name')}: autoTag should be 'bug', found '{qa_deck.get('autoTag')}'")
+                qa_path = f'{space_path}.decks[{qa_deck.index}]'
+                if not qa_deck.has_auto_tag:
+                    report.warning('qa-deck-auto-tag', qa_path, f"{qa_deck.name}: QA deck should have autoTag='bug' to automatically tag all cards")
+                elif qa_deck.auto_tag != 'bug':
+                    report.warning('qa-deck-auto-tag', f'{qa_path}.autoTag', f"{qa_deck.name}: autoTag should be 'bug', found '{qa_deck.auto_tag}'")
 
                 # Check name consistency
-                if qa_deck.get('name') != 'Bugs & QA':
-                    warnings.append(f"{qa_deck.get('name')}: QA deck should be named 'Bugs & QA' for consistency")
+                if qa_deck.name != 'Bugs & QA':
+                    report.warning('qa-deck-name', f'{qa_path}.name', f"{qa_deck.name}: QA deck should be named 'Bugs & QA' for consistency")
+            PROFILER.lap('qa-deck')
 
             for deck in decks:
-                if deck.get('deckType') != 'task':
-                    issues.append(f"{deck.get('name')}: Production deck missing deckType='task'")
+                deck_path = f'{space_path}.decks[{deck.index}]'
+                if deck.deck_type != 'task':
+                    report.error('production-deck-type', f'{deck_path}.deckType', f"{deck.name}: Production deck missing deckType='task'")
 
-                if len(deck.get('cards', [])) == 0:
-                    issues.append(f"{deck.get('name')}: Empty deck (needs at least 1 card)")
+                if deck.card_count == 0:
+                    report.error('deck-empty', f'{deck_path}.cards', f"{deck.name}: Empty deck (needs at least 1 card)")
 
                 # Check preferredOrder
-                if 'preferredOrder' not in deck:
-                    warnings.append(f"{deck.get('name')}: Missing preferredOrder (recommended for task decks)")
+                if not deck.has_preferred_order:
+                    report.warning('deck-preferred-order', deck_path, f"{deck.name}: Missing preferredOrder (recommended for task decks)")
 
                 # Check deck images for production decks
-                if 'coverFileUrl' not in deck or not deck.get('coverFileUrl'):
-                    issues.append(f"{deck.get('name')}: Deck missing 'coverFileUrl' field - all decks should have a visual")
+                if not deck.cover_file_url:
+                    report.error('deck-cover', f'{deck_path}.coverFileUrl', f"{deck.name}: Deck missing 'coverFileUrl' field - all decks should have a visual")
+                PROFILER.lap('production-decks')
 
                 # Check effort on production example cards
-                cards = deck.get('cards', [])
-                for card in cards:
-                    if 'effort' not in card or card.get('effort') is None:
-                        warnings.append(f"{deck.get('name')}: Example card missing effort value")
-                    elif card.get('effort', 0) < 1:
-                        warnings.append(f"{deck.get('name')}: Example card has effort < 1")
+                for card in deck.cards:
+                    effort_path = f'{deck_path}.cards[{card.index}].effort'
+                    if card.effort_state == 'missing':
+                        report.warning('production-card-effort', effort_path, f"{deck.name}: Example card missing effort value")
+                    elif card.effort_state == 'low':
+                        report.warning('production-card-effort', effort_path, f"{deck.name}: Example card has effort < 1")
+                PROFILER.lap('production-card-effort')
+
+    return report.items
+
+# Most a template may create in a new workspace; override with --limit NAME=VALUE
+INSTANTIATION_LIMITS = {
+    'cards': 500,
+    'journey_cards': 250,
+    'tags': 1000,
+}
+
+# Measuring the payload serializes every card, so its limit only applies when
+# set, e.g. --limit payload_bytes=524288
+PAYLOAD_LIMIT = 'payload_bytes'
+
+INSTANTIATION_LABELS = {
+    'cards': 'cards',
+    'journey_cards': 'journey sub-cards',
+    'tags': 'tag assignments',
+    'payload_bytes': 'bytes of card payload',
+}
+
+def simulate_instantiation(template: Template) -> Dict[str, int]:
+    """Estimate what a workspace receives when the template is instantiated.
+
+    Every card is created as is. Each hero card also gets one sub-card per
+    journey step of its deck, and a deck's autoTag is added to every card in
+    it that doesn't have the tag yet. 'payload_bytes' is None if the template
+    was built without measuring payload.
+    """
+    measured = True
+    stats = {
+        'spaces': len(template.spaces), 'decks': 0, 'cards': 0, 'journey_cards': 0,
+        'steps': 0, 'sub_card_links': 0, 'tags': 0, 'payload_bytes': 0,
+    }
+    for space in template.spaces:
+        for deck in space.decks:
+            stats['decks'] += 1
+            stats['cards'] += deck.card_count
+            stats['sub_card_links'] += deck.sub_card_count
+            stats['tags'] += sum(deck.tag_counts.values())
+            measured = measured and deck.payload_bytes is not None
+            if measured:
+                stats['payload_bytes'] += deck.payload_bytes
+
+            if deck.auto_tag:
+                untagged = deck.card_count - deck.tag_counts.get(deck.auto_tag, 0)
+                stats['tags'] += untagged
+                if measured:
+                    # ,"bug" appended to each card's tag list
+                    stats['payload_bytes'] += untagged * (len(json.dumps(deck.auto_tag, ensure_ascii=False).encode('utf-8')) + 1)
+
+            stats['steps'] += len(deck.journey_steps)
+            if deck.deck_type == 'hero' and deck.journey_steps:
+                stats['journey_cards'] += deck.card_count * len(deck.journey_steps)
+                stats['tags'] += deck.card_count * sum(step.tag_count for step in deck.journey_steps)
+                if measured:
+                    stats['payload_bytes'] += deck.card_count * sum(step.payload_bytes for step in deck.journey_steps)
+
+    stats['cards'] += stats['journey_cards']
+    if not measured:
+        stats['payload_bytes'] = None
+    return stats
+
+def check_instantiation(stats: Dict[str, int], limits: Dict[str, int]) -> List[Dict]:
+    """Findings for simulated totals over their limits."""
+    report = Findings()
+    for name, limit in limits.items():
+        if stats[name] > limit:
+            report.error(
+                'instantiation-size', '$',
+                f"Instantiating creates {stats[name]} {INSTANTIATION_LABELS[name]}, over the limit of {limit}",
+            )
+    return report.items
+
+def validate_template(filepath: Path, stream: bool = False, limits: Optional[Dict[str, int]] = None,
+                      profile: bool = False, payload: bool = False) -> Dict:
+    """Validate a single template file.
+
+    With `stream`, the file is parsed incrementally instead of loaded whole.
+    `limits` overrides INSTANTIATION_LIMITS; an empty dict checks none.
+    The card payload is measured if `payload` is set or a payload limit
+    applies. With `profile`, the result carries this file's profiling
+    stats under 'profile'.
+    """
+    if limits is None:
+        limits = INSTANTIATION_LIMITS
+    payload = payload or PAYLOAD_LIMIT in limits
+    if profile:
+        PROFILER.enable()
+    with PROFILER.stage('parse-stream' if stream else 'parse'):
+        template = Template.from_stream(filepath, payload) if stream else Template.from_file(filepath, payload)
+    with PROFILER.stage('check'):
+        findings = check_template(template)
+    with PROFILER.stage('simulate'):
+        instantiation = simulate_instantiation(template)
+        findings += check_instantiation(instantiation, limits)
+    issues = [f['message'] for f in findings if f['severity'] == 'error']
 
     return {
         'file': filepath.name,
         'issues': issues,
-        'warnings': warnings,
-        'valid': len(issues) == 0
+        'warnings': [f['message'] for f in findings if f['severity'] == 'warning'],
+        'findings': findings,
+        'instantiation': instantiation,
+        'valid': len(issues) == 0,
+        **({'profile': PROFILER.drain()} if profile else {}),
     }
 
-def main():
-    """Validate all templates."""
-    templates_dir = Path('templates/cdx')
+def cache_version(limits: Dict[str, int], payload: bool = False) -> str:
+    """Cache version for a run. Results depend on the limits, so custom limits get their own version."""
+    version = RULES_VERSION
+    if limits != INSTANTIATION_LIMITS:
+        version += '-' + hashlib.sha256(json.dumps(limits, sort_keys=True).encode()).hexdigest()[:8]
+    if payload:
+        version += '-payload'
+    return version
 
-    if not templates_dir.exists():
-        print(f"Error: {templates_dir} not found")
-        return 1
+class ValidationCache:
+    """On-disk cache of validation results keyed by file content hash.
 
-    results = []
-    for template_path in sorted(templates_dir.glob('*.json')):
-        result = validate_template(template_path)
-        results.append(result)
+    Entries are only valid for the `RULES_VERSION` they were created with.
+    File stats are remembered too, so unchanged files are not even re-hashed.
+    Files that no longer exist are forgotten on save.
+    """
 
-    # Print results
-    all_valid = True
-    for result in results:
+    def __init__(self, path: Path, version: str = RULES_VERSION):
+        self.path = path
+        self.version = version
+        self.results = {}
+        self.files = {}
+        self.dirty = False
+
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == self.version:
+            self.results = data.get('results', {})
+            self.files = data.get('files', {})
+
+    def digest(self, filepath: Path) -> str:
+        """Return the content hash of a file, reusing it if the file is unchanged."""
+        stat = filepath.stat()
+        key = str(filepath.resolve())
+        known = self.files.get(key)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2]
+
+        digest = hashlib.sha256(filepath.read_bytes()).hexdigest()
+        self.files[key] = [stat.st_mtime_ns, stat.st_size, digest]
+        self.dirty = True
+        return digest
+
+    def get(self, filepath: Path) -> Optional[Dict]:
+        """Return the cached result for a file, or None."""
+        cached = self.results.get(self.digest(filepath))
+        if cached is None:
+            return None
+        return dict(cached, file=filepath.name)
+
+    def put(self, filepath: Path, result: Dict):
+        """Store the result for a file."""
+        self.results[self.digest(filepath)] = {k: v for k, v in result.items() if k != 'file'}
+        self.dirty = True
+
+    def save(self):
+        """Write the cache back to disk if anything changed."""
+        # Forget templates that were deleted or renamed since they were cached
+        gone = [key for key in self.files if not Path(key).exists()]
+        for key in gone:
+            del self.files[key]
+        if not self.dirty and not gone:
+            return
+        # Drop results no longer referenced by any known file
+        live = {entry[2] for entry in self.files.values()}
+        self.results = {digest: r for digest, r in self.results.items() if digest in live}
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': self.version, 'files': self.files, 'results': self.results}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+def iter_validate_templates(paths: List[Path], jobs: int = 1, cache: Optional[ValidationCache] = None,
+                            stream: bool = False, limits: Optional[Dict[str, int]] = None,
+                            profile: bool = False, payload: bool = False) -> Iterator[Tuple[Path, Dict]]:
+    """Validate several template files, optionally across a process pool.
+
+    Yields (path, result) in the same order as `paths` as soon as each result
+    is available. With a cache, only files whose content changed since the
+    last run are validated again.
+    """
+    cached = [cache.get(path) if cache else None for path in paths]
+    pending = [path for path, result in zip(paths, cached) if result is None]
+
+    validate = partial(validate_template, stream=stream, limits=limits, profile=profile, payload=payload)
+    with ExitStack() as stack:
+        if jobs <= 1 or len(pending) <= 1:
+            fresh = map(validate, pending)
+        else:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+            # Small chunks keep workers busy when file sizes vary a lot
+            chunksize = max(1, len(pending) // (jobs * 4))
+            fresh = executor.map(validate, pending, chunksize=chunksize)
+
+        for path, result in zip(paths, cached):
+            if result is None:
+                result = next(fresh)
+                if cache:
+                    cache.put(path, result)
+            yield path, result
+
+    if cache:
+        cache.save()
+
+class Reporter:
+    """Writes results as they arrive. Subclasses implement one output format."""
+
+    def __init__(self, out: TextIO, simulate: bool = False):
+        self.out = out
+        self.simulate = simulate
+
+    def start(self):
+        pass
+
+    def add(self, path: Path, result: Dict):
+        raise NotImplementedError
+
+    def add_near_duplicates(self, groups: Dict[str, List[Dict]]):
+        """Cross-template near-duplicates (--near-duplicates); ignored by default."""
+
+    def finish(self, count: int, all_valid: bool):
+        pass
+
+class TextReporter(Reporter):
+    """Human-readable output with emoji status markers."""
+
+    def add(self, path: Path, result: Dict):
         if result['issues'] or result['warnings']:
             status = '❌' if result['issues'] else '⚠️'
-            print(f"\n{status} {result['file']}")
+            print(f"\n{status} {result['file']}", file=self.out)
 
             for issue in result['issues']:
-                print(f"  ERROR: {issue}")
-                all_valid = False
+                print(f"  ERROR: {issue}", file=self.out)
 
             for warning in result['warnings']:
-                print(f"  WARN:  {warning}")
+                print(f"  WARN:  {warning}", file=self.out)
         else:
-            print(f"✅ {result['file']}")
+            print(f"✅ {result['file']}", file=self.out)
 
-    if all_valid:
-        print(f"\n✅ All {len(results)} templates passed validation!")
-        return 0
-    else:
-        print(f"\n❌ Some templates have errors")
+        stats = result.get('instantiation')
+        if self.simulate and stats:
+            print(
+                f"  📐 Creates {stats['cards']} cards ({stats['journey_cards']} from {stats['steps']} journey steps), "
+                f"{stats['decks']} decks, {stats['tags']} tag assignments, {stats['payload_bytes'] / 1024:.1f} KiB payload",
+                file=self.out,
+            )
+
+    def add_near_duplicates(self, groups: Dict[str, List[Dict]]):
+        for line in format_groups('cards', groups['cards']) + format_groups('decks', groups['decks']):
+            print(line, file=self.out)
+
+    def finish(self, count: int, all_valid: bool):
+        if all_valid:
+            print(f"\n✅ All {count} templates passed validation!", file=self.out)
+        else:
+            print(f"\n❌ Some templates have errors", file=self.out)
+
+class JsonLinesReporter(Reporter):
+    """One JSON object per template, followed by a summary line."""
+
+    def add(self, path: Path, result: Dict):
+        line = {
+            'type': 'result',
+            'file': path.as_posix(),
+            'valid': result['valid'],
+            'findings': result['findings'],
+            'instantiation': result.get('instantiation'),
+        }
+        self.out.write(json.dumps(line, ensure_ascii=False) + '\n')
+
+    def add_near_duplicates(self, groups: Dict[str, List[Dict]]):
+        self.out.write(json.dumps(dict(groups, type='near-duplicates'), ensure_ascii=False) + '\n')
+
+    def finish(self, count: int, all_valid: bool):
+        self.out.write(json.dumps({'type': 'summary', 'files': count, 'valid': all_valid}) + '\n')
+
+class JUnitReporter(Reporter):
+    """JUnit XML with one test suite per template and one test case per finding."""
+
+    def start(self):
+        self.out.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites name="validate-templates">\n')
+
+    def add(self, path: Path, result: Dict):
+        findings = result['findings']
+        errors = sum(1 for f in findings if f['severity'] == 'error')
+        self.out.write(
+            f'  <testsuite name={quoteattr(path.as_posix())} tests="{max(1, len(findings))}" '
+            f'failures="{errors}" errors="0" skipped="0">\n'
+        )
+        if not findings:
+            self.out.write(f'    <testcase classname={quoteattr(path.as_posix())} name="valid"/>\n')
+        for finding in findings:
+            name = quoteattr(f"{finding['rule']} {finding['path']}")
+            self.out.write(f'    <testcase classname={quoteattr(path.as_posix())} name={name}>\n')
+            if finding['severity'] == 'error':
+                self.out.write(f'      <failure message={quoteattr(finding["message"])} type="{finding["rule"]}"/>\n')
+            else:
+                self.out.write(f'      <system-out>{escape("WARN: " + finding["message"])}</system-out>\n')
+            self.out.write('    </testcase>\n')
+        self.out.write('  </testsuite>\n')
+
+    def finish(self, count: int, all_valid: bool):
+        self.out.write('</testsuites>\n')
+
+class SarifReporter(Reporter):
+    """SARIF 2.1.0 log. Results are appended to the open results array as they arrive."""
+
+    def start(self):
+        self.first = True
+        driver = {
+            'name': 'validate-templates',
+            'rules': [
+                {'id': rule_id, 'shortDescription': {'text': description}}
+                for rule_id, description in RULES.items()
+            ],
+        }
+        header = json.dumps({
+            '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+            'version': '2.1.0',
+            'runs': [{'tool': {'driver': driver}, 'results': []}],
+        }, ensure_ascii=False)
+        # Leave the results array open so results can be streamed into it
+        self.footer = ']}]}\n'
+        self.out.write(header[:-len(']}]}')])
+
+    def add(self, path: Path, result: Dict):
+        for finding in result['findings']:
+            sarif_result = {
+                'ruleId': finding['rule'],
+                'level': finding['severity'],
+                'message': {'text': finding['message']},
+                'locations': [{
+                    'physicalLocation': {'artifactLocation': {'uri': path.as_posix()}},
+                    'logicalLocations': [{'fullyQualifiedName': finding['path']}],
+                }],
+            }
+            self.out.write(('' if self.first else ',') + '\n' + json.dumps(sarif_result, ensure_ascii=False))
+            self.first = False
+
+    def finish(self, count: int, all_valid: bool):
+        self.out.write(self.footer)
+
+REPORTERS = {
+    'text': TextReporter,
+    'jsonl': JsonLinesReporter,
+    'junit': JUnitReporter,
+    'sarif': SarifReporter,
+}
+
+def changed_templates(paths: List[Path], diff_range: str) -> List[Path]:
+    """Return the subset of `paths` changed in a git diff range (e.g. 'origin/main...HEAD')."""
+    toplevel = subprocess.run(
+        ['git', 'rev-parse', '--show-toplevel'],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+    changed = subprocess.run(
+        ['git', 'diff', '--name-only', '--diff-filter=ACMR', diff_range, '--', '*.json'],
+        check=True, capture_output=True, text=True, cwd=toplevel,
+    ).stdout.splitlines()
+
+    changed = {(Path(toplevel) / name).resolve() for name in changed}
+    return [path for path in paths if path.resolve() in changed]
+
+class InotifyWatcher:
+    """Reports changed template files using Linux inotify (through ctypes)."""
+
+    name = 'inotify'
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_DELETE = 0x200
+    EVENT = struct.Struct('iIII')  # wd, mask, cookie, name length
+    # Editors often save as write + rename; collect the whole burst
+    SETTLE_SECONDS = 0.01
+
+    def __init__(self, directory: Path):
+        import ctypes
+        import ctypes.util
+
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def wait(self) -> Set[Path]:
+        """Block until template files change and return their paths."""
+        names = set()
+        timeout = None
+        while True:
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+            if not ready:
+                if names:
+                    return {self.directory / name for name in names}
+                continue
+            data = os.read(self.fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = self.EVENT.unpack_from(data, offset)
+                offset += self.EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if name.endswith('.json'):
+                    names.add(name)
+            timeout = self.SETTLE_SECONDS if names else None
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Reports changed template files by comparing mtimes and sizes."""
+
+    name = 'polling'
+
+    def __init__(self, directory: Path, interval: float = 0.1):
+        self.directory = directory
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.directory.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self) -> Set[Path]:
+        """Block until template files change and return their paths."""
+        while True:
+            time.sleep(self.interval)
+            current = self.scan()
+            changed = {path for path in current.keys() | self.snapshot.keys()
+                       if current.get(path) != self.snapshot.get(path)}
+            self.snapshot = current
+            if changed:
+                return changed
+
+    def close(self):
+        pass
+
+def make_watcher(directory: Path, poll: bool = False):
+    """inotify where available, polling otherwise."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory)
+
+def watch_templates(templates_dir: Path, reporter: Reporter, out: TextIO, cache: Optional[ValidationCache],
+                    stream: bool = False, poll: bool = False, limits: Optional[Dict[str, int]] = None,
+                    payload: bool = False):
+    """Re-validate templates as they are saved, until interrupted."""
+    watcher = make_watcher(templates_dir, poll=poll)
+    print(f"\n👀 Watching {templates_dir}/ ({watcher.name}), press Ctrl+C to stop", file=sys.stderr)
+    try:
+        while True:
+            changed = watcher.wait()
+            start = time.perf_counter()
+            for path in sorted(changed):
+                if not path.exists():
+                    print(f"🗑️  {path.name} removed", file=sys.stderr)
+                    continue
+                try:
+                    _, result = next(iter_validate_templates([path], cache=cache, stream=stream, limits=limits,
+                                                                 payload=payload))
+                except ValueError as e:
+                    # Half-saved or broken JSON; wait for the next save
+                    print(f"\n❌ {path.name}\n  ERROR: Invalid JSON: {e}", file=out)
+                    continue
+                reporter.add(path, result)
+            out.flush()
+            # iter_validate_templates only saves once exhausted, and next() doesn't exhaust it
+            if cache:
+                cache.save()
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"⏱️  {len(changed)} file(s) checked in {elapsed:.0f} ms", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+def parse_limit(value: str) -> Tuple[str, int]:
+    """Parse NAME=VALUE for --limit."""
+    name, _, number = value.partition('=')
+    if name not in INSTANTIATION_LABELS or not number.isdigit():
+        raise argparse.ArgumentTypeError(
+            f"expected NAME=VALUE with NAME one of {', '.join(INSTANTIATION_LABELS)}, got '{value}'"
+        )
+    return name, int(number)
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Validate Codecks templates against quality standards.")
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help="Number of worker processes (default: 1, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        '--stream', action='store_true',
+        help="Parse templates incrementally to keep memory flat for very large files (requires ijson)",
+    )
+    parser.add_argument(
+        '--format', choices=sorted(REPORTERS), default='text',
+        help="Output format. Machine-readable formats are written per file as soon as it is validated",
+    )
+    parser.add_argument(
+        '-o', '--output', type=Path,
+        help="Write the report to a file instead of stdout",
+    )
+    parser.add_argument(
+        '--changed-only', metavar='RANGE',
+        help="Only validate templates changed in a git diff range (e.g. 'origin/main...HEAD')",
+    )
+    parser.add_argument(
+        '--cache-file', type=Path, default=DEFAULT_CACHE_FILE,
+        help=f"Where to store cached results (default: {DEFAULT_CACHE_FILE})",
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help="Validate every file again and don't read or write the cache",
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="After the first run, re-validate templates as they are saved (text and jsonl formats)",
+    )
+    parser.add_argument(
+        '--poll', action='store_true',
+        help="With --watch, poll for changes instead of using inotify (e.g. on network drives)",
+    )
+    parser.add_argument(
+        '--simulate', action='store_true',
+        help="Show what instantiating each template creates (cards, journey sub-cards, tags, payload size)",
+    )
+    parser.add_argument(
+        '--limit', action='append', type=parse_limit, default=[], metavar='NAME=VALUE',
+        help="Override an instantiation limit, e.g. cards=800 (repeatable; "
+             + ', '.join(f"{k}={v}" for k, v in INSTANTIATION_LIMITS.items())
+             + f"; {PAYLOAD_LIMIT} is off unless set)",
+    )
+    parser.add_argument(
+        '--profile', nargs='?', type=Path, const=Path('validate-profile.json'), metavar='PATH',
+        help="Record time, calls and memory per rule and stage, print a summary and write a JSON "
+             "report (default PATH: validate-profile.json). Disables the cache",
+    )
+    parser.add_argument(
+        '--near-duplicates', nargs='?', type=parse_threshold, const=NEAR_DUPLICATE_THRESHOLD, metavar='THRESHOLD',
+        help="Also report near-duplicate cards and decks across all templates "
+             f"(Jaccard similarity, default {NEAR_DUPLICATE_THRESHOLD}; text and jsonl formats)",
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Validate all templates."""
+    args = parse_args(argv)
+    templates_dir = Path('templates/cdx')
+
+    if not templates_dir.exists():
+        print(f"Error: {templates_dir} not found")
         return 1
 
+    paths = sorted(templates_dir.glob('*.json'))
+    if args.changed_only:
+        try:
+            paths = changed_templates(paths, args.changed_only)
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, 'stderr', '') or e
+            print(f"Error: could not get changed files for '{args.changed_only}': {str(stderr).strip()}")
+            return 1
+        if not paths and args.format == 'text':
+            print(f"✅ No templates changed in {args.changed_only}")
+            return 0
+
+    if args.watch and args.format not in ('text', 'jsonl'):
+        print(f"Error: --watch only supports text and jsonl output, not {args.format}")
+        return 1
+
+    limits = dict(INSTANTIATION_LIMITS, **dict(args.limit))
+    # The payload is only worth measuring when it is checked or shown
+    payload = args.simulate or PAYLOAD_LIMIT in limits
+    # Cached files aren't validated, so there would be nothing to profile
+    cache = None if args.no_cache or args.profile else ValidationCache(args.cache_file, version=cache_version(limits, payload))
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    reporter = REPORTERS[args.format](out, simulate=args.simulate)
+    reporter.start()
+
+    count = 0
+    all_valid = True
+    profiled = Profiler(memory=True) if args.profile else None
+    start = time.perf_counter()
+    try:
+        for path, result in iter_validate_templates(paths, jobs=jobs, cache=cache, stream=args.stream, limits=limits,
+                                                    profile=bool(args.profile), payload=payload):
+            if profiled:
+                # Stats come back with each result, also from worker processes
+                profiled.merge(result.pop('profile'))
+            reporter.add(path, result)
+            out.flush()
+            count += 1
+            all_valid = all_valid and result['valid']
+        if args.near_duplicates is not None:
+            reporter.add_near_duplicates(find_near_duplicates(sorted(templates_dir.glob('*.json')), args.near_duplicates))
+        reporter.finish(count, all_valid)
+        if profiled:
+            wall = time.perf_counter() - start
+            # Keep machine-readable output on stdout parseable
+            info = sys.stderr if args.format != 'text' and out is sys.stdout else sys.stdout
+            profiled.print_summary(f"Validated {count} templates", wall, file=info)
+            profiled.write_report(args.profile, wall, files=count, jobs=jobs, stream=args.stream)
+            print(f"✅ Profile written to {args.profile}", file=info)
+        if args.watch:
+            watch_templates(templates_dir, reporter, out, cache, stream=args.stream, poll=args.poll, limits=limits,
+                            payload=payload)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    return 0 if all_valid else 1
+
 if __name__ == '__main__':
     exit(main())